@@ -1,19 +1,33 @@
-import json
+import os
+import sys
 import matplotlib.pyplot as plt
 
-# Load the benchmark results
-with open("benchmark_results.json", "r") as f:
-    data = json.load(f)
+# The columnar result store lives with the Python sources
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python"))
+from columnar import import_go_results
 
-# Extract relevant values
-num_quorums = [entry["num_quorums"] for entry in data]
-encoding_times = [entry["encoding_time_ms"] for entry in data]
-decoding_times = [entry["decoding_time_ms"] for entry in data]
+# Results of src/Python/rs_benchmark.py, same schema; drawn alongside when present
+PYTHON_RESULTS = ["python_benchmark_results.json", "../Python/python_benchmark_results.json"]
+
+# Load the benchmark results, averaging repeated runs per quorum count
+results = import_go_results("benchmark_results.json")
+encoding = results.aggregate("encoding_time_ms")
+decoding = results.aggregate("decoding_time_ms")
 
 # Plotting
 plt.figure(figsize=(10, 6))
-plt.plot(num_quorums, encoding_times, marker='o', color='green', label='Encoding Time (ms)')
-plt.plot(num_quorums, decoding_times, marker='x', color='orange', label='Decoding Time (ms)')
+plt.plot(encoding["groups"], encoding["mean"], marker='o', color='green', label='Encoding Time (ms)')
+plt.plot(decoding["groups"], decoding["mean"], marker='x', color='orange', label='Decoding Time (ms)')
+
+python_path = next((path for path in PYTHON_RESULTS if os.path.exists(path)), None)
+if python_path:
+    python_results = import_go_results(python_path)
+    python_encoding = python_results.aggregate("encoding_time_ms")
+    python_decoding = python_results.aggregate("decoding_time_ms")
+    plt.plot(python_encoding["groups"], python_encoding["mean"],
+             marker='o', linestyle='--', color='green', alpha=0.6, label='Python Encoding Time (ms)')
+    plt.plot(python_decoding["groups"], python_decoding["mean"],
+             marker='x', linestyle='--', color='orange', alpha=0.6, label='Python Decoding Time (ms)')
 
 plt.xlabel("Number of Quorums")
 plt.ylabel("Time (ms)")
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from main import BYZANTINE_FRACTION, Quorum, QUORUM_CACHE, GENERATOR_TABLE_CACHE, prepare_backend, verify_signature
+
+# Quorum sizes, lookups per size and in-flight lookup bound for the throughput run
+QUORUM_SIZES = [10, 50, 100]
+NUM_LOOKUPS = 200
+CONCURRENCY = 32
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+class AsyncLookupDriver:
+    # Signing goes through Quorum.collect_shares with each quorum's
+    # SigningPool, so Byzantine peers and the nonce pool behave as in a
+    # single lookup. Dealing, signing, combining and recovery block, so they
+    # run on the loop's default thread pool; verification runs in executor.
+    # Lookups share the quorum, so each keeps its presignature, shares and
+    # dealer time to itself instead of in the quorum's last-round state.
+    def __init__(self, quorums, concurrency=CONCURRENCY, executor=None, sign_workers=None):
+        self.quorums = quorums
+        self.concurrency = concurrency
+        self.owns_executor = executor is None
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, initializer=prepare_backend,
+                                           initargs=(GENERATOR_TABLE_CACHE,))
+        self.executor = executor
+        sign_workers = sign_workers or max(1, (os.cpu_count() or 1) // len(quorums))
+        for quorum in quorums:
+            quorum.enable_parallel_signing(sign_workers)
+
+    async def lookup(self, quorum, semaphore, submitted):
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            started = time.perf_counter()
+            message = f"REQUEST|{uuid.uuid4()}|{time.time()}"
+            signers = random.sample(range(quorum.sQ), quorum.tQ + 1)
+            presignature, _, _ = await loop.run_in_executor(None, quorum.draw_presignature)
+            signatures = await loop.run_in_executor(None, quorum.collect_shares, signers, message, True,
+                                                    presignature)
+            combined_signature, _ = await loop.run_in_executor(None, quorum.combine_shares, signatures, signers,
+                                                               message)
+            ok = await loop.run_in_executor(self.executor, verify_signature, quorum.public_key,
+                                            message.encode(), combined_signature)
+            if not ok:
+                combined_signature, _ = await loop.run_in_executor(None, quorum.recover, message, signatures,
+                                                                   signers, presignature)
+                ok = combined_signature is not None
+            finished = time.perf_counter()
+        return finished - submitted, started - submitted, ok
+
+    async def run(self, num_lookups):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start_time = time.perf_counter()
+        tasks = [asyncio.create_task(self.lookup(self.quorums[i % len(self.quorums)], semaphore,
+                                                 time.perf_counter()))
+                 for i in range(num_lookups)]
+        results = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start_time
+        # Failed lookups count against throughput and stay out of the latencies
+        completed = [r for r in results if r[2]]
+        latencies = sorted(r[0] * 1e3 for r in completed)
+        queue_delays = sorted(r[1] * 1e3 for r in results)
+        return {
+            'lookups': num_lookups,
+            'failed': num_lookups - len(completed),
+            'concurrency': self.concurrency,
+            'elapsed_s': elapsed,
+            'throughput': len(completed) / elapsed if elapsed else 0.0,
+            'latency_p50_ms': percentile(latencies, 50),
+            'latency_p95_ms': percentile(latencies, 95),
+            'latency_p99_ms': percentile(latencies, 99),
+            'queue_delay_mean_ms': sum(queue_delays) / len(queue_delays) if queue_delays else 0.0,
+            'queue_delay_p95_ms': percentile(queue_delays, 95),
+        }
+
+    def close(self):
+        for quorum in self.quorums:
+            quorum.close()
+        if self.owns_executor:
+            self.executor.shutdown()
+
+
+def measure_throughput(sQ, num_lookups=NUM_LOOKUPS, concurrency=CONCURRENCY, num_quorums=1,
+                       byzantine_fraction=BYZANTINE_FRACTION):
+    tQ = sQ // 3
+    quorums = [Quorum(str(i), sQ, tQ, cache=QUORUM_CACHE, seed=i, byzantine_fraction=byzantine_fraction)
+               for i in range(num_quorums)]
+    driver = AsyncLookupDriver(quorums, concurrency)
+    try:
+        # Warm the worker processes before the measured run
+        asyncio.run(driver.run(min(concurrency, num_lookups)))
+        return asyncio.run(driver.run(num_lookups))
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    print(f"\nConcurrent lookups ({NUM_LOOKUPS} per quorum size, concurrency {CONCURRENCY}):")
+    for sQ in QUORUM_SIZES:
+        metrics = measure_throughput(sQ)
+        print(f"sQ = {sQ}:")
+        print(f"  Throughput: {metrics['throughput']:.2f} lookups/s ({metrics['failed']} failed)")
+        print(f"  Latency p50/p95/p99: {metrics['latency_p50_ms']:.3f} / {metrics['latency_p95_ms']:.3f} / "
+              f"{metrics['latency_p99_ms']:.3f} ms")
+        print(f"  Queueing Delay mean/p95: {metrics['queue_delay_mean_ms']:.3f} / "
+              f"{metrics['queue_delay_p95_ms']:.3f} ms")
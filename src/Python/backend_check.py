@@ -0,0 +1,108 @@
+import random
+import sys
+import time
+
+from main import GENERATOR_TABLE_CACHE
+from ec_point_operation import curve, negative, scalar_multiply
+import ec_backend
+import signing
+
+# Cross-backend correctness checks: every backend must agree with the demo
+# library's double-and-add on generator and variable-base multiplication,
+# point addition edge cases and multi-scalar multiplication, and sign/verify
+# round trips in both directions.
+NUM_RANDOM = 25
+EDGE_SCALARS = [0, 1, 2, 3, curve.n - 1, curve.n, curve.n + 1, 2 ** 128, 2 ** 256 - 1]
+
+
+def check_backends(num_random=NUM_RANDOM, seed=None):
+    rng = random.Random(seed)
+    failures = []
+    names = sorted(ec_backend.BACKENDS)
+    backends = {name: ec_backend.BACKENDS[name]() for name in names}
+    for b in backends.values():
+        b.prepare(GENERATOR_TABLE_CACHE)
+
+    scalars = EDGE_SCALARS + [rng.randrange(1, curve.n) for _ in range(num_random)]
+    points = [curve.g] + [scalar_multiply(rng.randrange(1, curve.n), curve.g) for _ in range(3)]
+
+    for k in scalars:
+        expected = scalar_multiply(k % curve.n, curve.g)
+        for name, b in backends.items():
+            if b.multiply_g(k) != expected:
+                failures.append(f"{name}: multiply_g({k:#x})")
+        for point in points:
+            expected = scalar_multiply(k % curve.n, point)
+            for name, b in backends.items():
+                if b.multiply(k, point) != expected:
+                    failures.append(f"{name}: multiply({k:#x}, {point[0]:#x})")
+
+    for p in points:
+        for q in points + [p, negative(p), None]:
+            results = {name: b.add(p, q) for name, b in backends.items()}
+            if len(set(results.values())) != 1:
+                failures.append(f"add disagreement {results}")
+            if q is None and results[names[0]] != p:
+                failures.append("add with infinity")
+            if q == negative(p) and results[names[0]] is not None:
+                failures.append("P + (-P) is not infinity")
+        for name, b in backends.items():
+            if b.add(p, p) != b.multiply(2, p):
+                failures.append(f"{name}: P + P != 2P")
+
+    for size in (1, 3, 40):
+        ks = [rng.randrange(curve.n) for _ in range(size)]
+        ps = [scalar_multiply(rng.randrange(1, curve.n), curve.g) for _ in range(size)]
+        expected = None
+        for k, point in zip(ks, ps):
+            expected = backends['demo'].add(expected, scalar_multiply(k, point))
+        for name, b in backends.items():
+            if b.multi_multiply(ks, ps) != expected:
+                failures.append(f"{name}: multi_multiply with {size} terms")
+
+    for signer in names:
+        for verifier in names:
+            d = rng.randrange(1, curve.n)
+            public_key = backends[verifier].multiply_g(d)
+            message = f"check|{rng.random()}".encode()
+            ec_backend._backend = backends[signer]
+            signature = signing.sign(d, message)
+            ec_backend._backend = backends[verifier]
+            if not signing.verify_signature(public_key, message, signature):
+                failures.append(f"sign with {signer}, verify with {verifier}")
+            if signing.verify_signature(public_key, message + b'!', signature):
+                failures.append(f"{verifier} accepted a tampered message")
+    ec_backend._backend = None
+    return failures
+
+
+def time_backends(repeats=50, seed=None):
+    rng = random.Random(seed)
+    scalars = [rng.randrange(1, curve.n) for _ in range(repeats)]
+    point = scalar_multiply(rng.randrange(1, curve.n), curve.g)
+    timings = {}
+    for name in sorted(ec_backend.BACKENDS):
+        b = ec_backend.BACKENDS[name]()
+        b.prepare(GENERATOR_TABLE_CACHE)
+        start = time.perf_counter()
+        for k in scalars:
+            b.multiply_g(k)
+        g_time = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for k in scalars:
+            b.multiply(k, point)
+        p_time = (time.perf_counter() - start) / repeats
+        timings[name] = (g_time * 1e3, p_time * 1e3)
+    return timings
+
+
+if __name__ == "__main__":
+    failures = check_backends()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"\nBackends {', '.join(sorted(ec_backend.BACKENDS))}: "
+          f"{'all checks passed' if not failures else f'{len(failures)} failures'}")
+    print("\nAverage multiplication time (in milliseconds):")
+    for name, (g_time, p_time) in time_backends().items():
+        print(f"  {name:<10} k*G {g_time:.4f}   k*P {p_time:.4f}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,72 @@
+import secrets
+
+from ec_point_operation import curve
+from sign import hash_to_int
+from ec_backend import multi_multiply
+from signing import lift_x
+from instrumentation import span
+
+# Batch ECDSA verification for (message, (r, s, v), public_key) items, where
+# v is the y parity of the nonce point R (see signing.sign_recoverable).
+# A valid signature satisfies u1*G + u2*Q - R = O; with random 128-bit
+# weights z_i the whole batch collapses into one multi-scalar
+# multiplication sum(z_i*u1_i)*G + sum(z_i*u2_i*Q_i) - sum(z_i*R_i) = O.
+# Terms sharing a public key are merged before the MSM.
+WEIGHT_BITS = 128
+
+
+def batch_verify(items):
+    with span('verify.batch'):
+        g_scalar = 0
+        key_scalars = {}
+        nonce_scalars = []
+        nonce_points = []
+        for index, (message, signature, public_key) in enumerate(items):
+            r, s, v = signature
+            if not (0 < r < curve.n and 0 < s < curve.n):
+                return False
+            nonce_point = lift_x(r, v)
+            if nonce_point is None:
+                return False
+            z = 1 if index == 0 else secrets.randbits(WEIGHT_BITS) | 1
+            w = pow(s, -1, curve.n)
+            g_scalar += z * hash_to_int(message) * w
+            key = tuple(public_key)
+            key_scalars[key] = key_scalars.get(key, 0) + z * r * w
+            nonce_scalars.append(curve.n - z)
+            nonce_points.append(nonce_point)
+        scalars = [g_scalar % curve.n] + [k % curve.n for k in key_scalars.values()] + nonce_scalars
+        points = [curve.g] + list(key_scalars) + nonce_points
+        return multi_multiply(scalars, points) is None
+
+
+def batch_verify_shares(message, items):
+    # items are ((r, s_i, v), (W_i, U_i)) signature shares for one message
+    # with the dealer's commitments for the signer (see
+    # signing.presignature_commitment); each must satisfy
+    # s_i*G - e*W_i - r*U_i = O.
+    with span('verify.shares'):
+        e = hash_to_int(message)
+        g_scalar = 0
+        scalars = []
+        points = []
+        for index, ((r, s, _), (inverse_commitment, key_commitment)) in enumerate(items):
+            if not 0 < r < curve.n:
+                return False
+            z = 1 if index == 0 else secrets.randbits(WEIGHT_BITS) | 1
+            g_scalar += z * s
+            scalars += [-z * e % curve.n, -z * r % curve.n]
+            points += [inverse_commitment, key_commitment]
+        return multi_multiply([g_scalar % curve.n] + scalars, [curve.g] + points) is None
+
+
+def find_invalid(items, check=batch_verify):
+    # Indices of the items that fail, found by bisecting failing batches
+    if not items or check(items):
+        return []
+    if len(items) == 1:
+        return [0]
+    middle = len(items) // 2
+    left = find_invalid(items[:middle], check)
+    right = find_invalid(items[middle:], check)
+    return left + [middle + i for i in right]
@@ -0,0 +1,80 @@
+import json
+import time
+
+from main import GENERATOR_TABLE_CACHE, QUORUM_CACHE, Quorum, prepare_backend, verify_signature
+from ec_point_operation import curve
+from batch_verify import batch_verify, find_invalid
+
+# Batches of combined quorum signatures, as an initiator collects them along
+# a lookup path: 'same key' signs every message with one quorum, 'distinct
+# keys' with one quorum per message
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+NUM_KEYS = {'same key': 1, 'distinct keys': None}
+REPEATS = 3
+QUORUM_SIZE = 10
+
+
+def make_quorums(num_quorums, sQ=QUORUM_SIZE):
+    return [Quorum(str(i), sQ, sQ // 3, cache=QUORUM_CACHE, seed=i) for i in range(num_quorums)]
+
+
+def make_items(batch_size, quorums):
+    items = []
+    for i in range(batch_size):
+        quorum = quorums[i % len(quorums)]
+        message = f"ROUTE|{quorum.id}|{i}|{time.time()}"
+        signatures, valid, signers, _ = quorum.respond(message, num_signers=quorum.tQ + 1)
+        if not valid:
+            raise RuntimeError(f"quorum {quorum.id} returned an invalid signature share")
+        combined_signature, _ = quorum.combine_shares(signatures, signers, message)
+        items.append((message.encode(), combined_signature, quorum.public_key))
+    return items
+
+
+def best_of(fn, repeats=REPEATS):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark_batch_verify(batch_sizes=BATCH_SIZES):
+    results = []
+    quorums = make_quorums(max(batch_sizes))
+    for mode, num_keys in NUM_KEYS.items():
+        for batch_size in batch_sizes:
+            items = make_items(batch_size, quorums[:num_keys or batch_size])
+            single_time, single_ok = best_of(lambda: all(verify_signature(q, m, sig) for m, sig, q in items))
+            batch_time, batch_ok = best_of(lambda: batch_verify(items))
+            # One corrupted signature: cost of locating it by bisection
+            bad = list(items)
+            message, (r, s, v), q = bad[-1]
+            bad[-1] = (message, (r, (s + 1) % curve.n, v), q)
+            bisect_time, invalid = best_of(lambda: find_invalid(bad))
+            results.append({
+                'mode': mode,
+                'batch_size': batch_size,
+                'individual_ms_per_sig': single_time / batch_size * 1e3,
+                'batch_ms_per_sig': batch_time / batch_size * 1e3,
+                'bisect_ms_per_sig': bisect_time / batch_size * 1e3,
+                'speedup': single_time / batch_time,
+                'all_valid': single_ok and batch_ok,
+                'found_invalid': invalid == [batch_size - 1],
+            })
+    return results
+
+
+if __name__ == "__main__":
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    results = benchmark_batch_verify()
+    with open('batch_verify_results.json', 'w') as f:
+        json.dump(results, f, indent=4)
+    print("\nPer-signature verification time (in milliseconds) vs batch size:")
+    for row in results:
+        print(f"{row['mode']:<14} n = {row['batch_size']:<4} individual {row['individual_ms_per_sig']:.4f}  "
+              f"batch {row['batch_ms_per_sig']:.4f} ({row['speedup']:.2f}x)  "
+              f"with one bad signature {row['bisect_ms_per_sig']:.4f}"
+              + ('' if row['all_valid'] and row['found_invalid'] else '  MISMATCH'))
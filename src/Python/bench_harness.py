@@ -0,0 +1,144 @@
+import gc
+import json
+import math
+import random
+import statistics
+import time
+
+from main import (PEER_COUNTS, QUORUM_CACHE, GENERATOR_TABLE_CACHE, Quorum, prepare_backend,
+                  verify_signature)
+from threshold_signature import ThresholdSignature
+
+# Repetition policy: warm up, then repeat until the 95% CI of the median is
+# narrower than CI_TARGET (relative half-width) or MAX_RUNS is reached.
+WARMUP = 3
+MIN_RUNS = 10
+MAX_RUNS = 200
+KEYGEN_MAX_RUNS = 20
+CI_TARGET = 0.05
+DISABLE_GC = True
+# Modified z-score cutoff (Iglewicz and Hoaglin) for outlier rejection
+OUTLIER_THRESHOLD = 3.5
+Z_95 = 1.96
+
+
+def mad(values, center):
+    return statistics.median(abs(v - center) for v in values)
+
+
+def remove_outliers(values):
+    center = statistics.median(values)
+    spread = mad(values, center)
+    if spread == 0:
+        return list(values)
+    return [v for v in values if 0.6745 * abs(v - center) / spread <= OUTLIER_THRESHOLD]
+
+
+def median_ci(values, z=Z_95):
+    # Distribution-free CI of the median from order statistics
+    ordered = sorted(values)
+    n = len(ordered)
+    half = z * math.sqrt(n) / 2
+    lo = max(int(math.floor(n / 2 - half)), 0)
+    hi = min(int(math.ceil(n / 2 + half)), n - 1)
+    return ordered[lo], ordered[hi]
+
+
+def summarize(samples_ns):
+    kept = remove_outliers(samples_ns)
+    center = statistics.median(kept)
+    lo, hi = median_ci(kept)
+    return {
+        'runs': len(samples_ns),
+        'outliers': len(samples_ns) - len(kept),
+        'median_ms': center / 1e6,
+        'mad_ms': mad(kept, center) / 1e6,
+        'ci_low_ms': lo / 1e6,
+        'ci_high_ms': hi / 1e6,
+        'mean_ms': statistics.fmean(kept) / 1e6,
+    }
+
+
+def _converged(samples_ns, ci_target):
+    kept = remove_outliers(samples_ns)
+    center = statistics.median(kept)
+    lo, hi = median_ci(kept)
+    return center > 0 and (hi - lo) / 2 / center <= ci_target
+
+
+def measure(fn, setup=None, warmup=WARMUP, min_runs=MIN_RUNS, max_runs=MAX_RUNS,
+            ci_target=CI_TARGET, disable_gc=DISABLE_GC):
+    # setup() runs outside the timed region and its result is passed to fn()
+    for _ in range(warmup):
+        fn(setup() if setup else None)
+    samples = []
+    while len(samples) < max_runs:
+        state = setup() if setup else None
+        gc_was_enabled = gc.isenabled()
+        if disable_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            fn(state)
+            samples.append(time.perf_counter_ns() - start)
+        finally:
+            if disable_gc and gc_was_enabled:
+                gc.enable()
+        if len(samples) >= min_runs and _converged(samples, ci_target):
+            break
+    result = summarize(samples)
+    result['converged'] = _converged(samples, ci_target)
+    return result
+
+
+def benchmark_phases(sQ):
+    tQ = sQ // 3
+    quorum = Quorum("0", sQ, tQ, cache=QUORUM_CACHE)
+
+    def request():
+        # The presignature is dealt here, outside the measured signing
+        message = f"REQUEST|harness|{time.time()}"
+        return message, random.sample(range(sQ), tQ + 1), quorum.take_presignature()
+
+    def sign_shares(state):
+        message, signers, presignature = state
+        return quorum.collect_shares(signers, message, presignature=presignature)
+
+    def signed_request():
+        state = request()
+        return state[0], state[1], sign_shares(state)
+
+    def combined_request():
+        message, signers, signatures = signed_request()
+        combined_signature, _ = quorum.combine_shares(signatures, signers, message)
+        return message.encode(), combined_signature
+
+    return {
+        'keygen': measure(lambda _: ThresholdSignature(group_size=sQ, threshold=tQ + 1), warmup=1, min_runs=5,
+                          max_runs=KEYGEN_MAX_RUNS),
+        'signing': measure(sign_shares, request),
+        'combining': measure(lambda s: quorum.combine_shares(s[2], s[1], s[0]), signed_request),
+        'verification': measure(lambda s: verify_signature(quorum.public_key, s[0], s[1]), combined_request),
+    }
+
+
+def run_harness(peer_counts=PEER_COUNTS, output='harness_results.json'):
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    results = {}
+    for sQ in peer_counts:
+        results[str(sQ)] = benchmark_phases(sQ)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=4)
+    return results
+
+
+if __name__ == "__main__":
+    results = run_harness()
+    print("\nMedian [95% CI] and MAD (in milliseconds) for each Number of Peers (sQ):")
+    for sQ, phases in results.items():
+        print(f"sQ = {sQ}:")
+        for phase, r in phases.items():
+            flag = '' if r['converged'] else ' (CI target not reached)'
+            print(f"  {phase:<12} {r['median_ms']:.5f} [{r['ci_low_ms']:.5f}, {r['ci_high_ms']:.5f}] "
+                  f"MAD {r['mad_ms']:.5f}, n={r['runs']}, outliers={r['outliers']}{flag}")
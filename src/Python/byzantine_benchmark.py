@@ -0,0 +1,56 @@
+import json
+import statistics
+
+from main import GENERATOR_TABLE_CACHE, QUORUM_CACHE, Initiator, Quorum, prepare_backend
+
+# Lookup latency as the share of Byzantine peers grows: the optimistic
+# combine fails as soon as one corrupt share is among the t+1, and the
+# quorum falls back to share verification and spare signers.
+QUORUM_SIZES = [10, 50, 100]
+BYZANTINE_FRACTIONS = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
+NUM_RUNS = 10
+
+
+def benchmark_byzantine(quorum_sizes=QUORUM_SIZES, fractions=BYZANTINE_FRACTIONS, num_runs=NUM_RUNS):
+    results = []
+    for sQ in quorum_sizes:
+        tQ = sQ // 3
+        for fraction in fractions:
+            latencies = []
+            fallbacks = 0
+            failures = 0
+            for _ in range(num_runs):
+                # New faulty set every run; key material comes from the cache
+                quorum = Quorum("0", sQ, tQ, cache=QUORUM_CACHE, byzantine_fraction=fraction)
+                initiator = Initiator(quorum, sQ, tQ)
+                if not initiator.lookup():
+                    failures += 1
+                    continue
+                perf = initiator.performance
+                fallbacks += bool(perf['recovery_times'])
+                latencies.append(sum(perf['sign_times'] + perf['combine_times'] + perf['verify_times']
+                                     + perf['recovery_times']) * 1e3)
+            results.append({
+                'sQ': sQ,
+                'byzantine_fraction': fraction,
+                'mean_ms': statistics.fmean(latencies) if latencies else None,
+                'median_ms': statistics.median(latencies) if latencies else None,
+                'fallback_rate': fallbacks / num_runs,
+                'failures': failures,
+            })
+    return results
+
+
+if __name__ == "__main__":
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    results = benchmark_byzantine()
+    with open('byzantine_performance.json', 'w') as f:
+        json.dump(results, f, indent=4)
+    print("\nLookup latency (in milliseconds) vs fraction of Byzantine peers:")
+    for row in results:
+        if row['mean_ms'] is None:
+            print(f"sQ = {row['sQ']}, byzantine = {row['byzantine_fraction']:.0%}: no successful lookup")
+            continue
+        print(f"sQ = {row['sQ']}, byzantine = {row['byzantine_fraction']:.0%}: "
+              f"mean {row['mean_ms']:.3f}, median {row['median_ms']:.3f}, "
+              f"fallback {row['fallback_rate']:.0%}, failed {row['failures']}")
@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+
+
+class ChordRing:
+    # Sorted quorum IDs on a 2^m identifier ring. fingers[i, j] is the ID of
+    # successor(ids[i] + 2^j), matching buildFingerTables in src/Go/main.go.
+    def __init__(self, num_quorums, m=None, seed=None):
+        self.m = m or math.ceil(math.log2(max(num_quorums, 2))) + 4
+        self.ring_size = 1 << self.m
+        if num_quorums > self.ring_size:
+            raise ValueError(f"{num_quorums} quorums do not fit on a 2^{self.m} ring")
+        rng = np.random.default_rng(seed)
+        self.ids = np.sort(rng.choice(self.ring_size, size=num_quorums, replace=False)).astype(np.int64)
+        self.fingers = self.build_finger_tables()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def successor_index(self, targets):
+        # First ID >= target, wrapping to ids[0] like findSuccessor in Go
+        return np.searchsorted(self.ids, targets, side='left') % len(self.ids)
+
+    def build_finger_tables(self):
+        offsets = np.left_shift(1, np.arange(self.m, dtype=np.int64))
+        targets = (self.ids[:, None] + offsets[None, :]) % self.ring_size
+        return self.ids[self.successor_index(targets)]
+
+    def routing_table(self, index):
+        # Finger entries as the string map that coding/rs.go erasure-codes
+        node = int(self.ids[index])
+        return {f"finger{j}": f"Q{node} -> Q{int(dest)}" for j, dest in enumerate(self.fingers[index])}
+
+    def _arc(self, lo, hi):
+        # Indices of the IDs in the ring interval (lo, hi]
+        start = np.searchsorted(self.ids, lo, side='right')
+        end = np.searchsorted(self.ids, hi, side='right')
+        if lo < hi:
+            return np.arange(start, end)
+        return np.concatenate([np.arange(start, len(self.ids)), np.arange(0, end)])
+
+    def _fingers_targeting(self, lo, hi):
+        # (row, column) of every finger whose target lies in (lo, hi]: a target
+        # id + 2^j falls there exactly when id is in (lo - 2^j, hi - 2^j]
+        rows, cols = [], []
+        for j in range(self.m):
+            step = 1 << j
+            arc = self._arc((lo - step) % self.ring_size, (hi - step) % self.ring_size)
+            rows.append(arc)
+            cols.append(np.full(len(arc), j))
+        return np.concatenate(rows), np.concatenate(cols)
+
+    def join(self, quorum_id):
+        # Only fingers targeting (predecessor, quorum_id] change; they move from
+        # the old successor to the new quorum. Returns the indices (after the
+        # insert) of every quorum whose finger table changed, the new one included.
+        quorum_id %= self.ring_size
+        pos = int(np.searchsorted(self.ids, quorum_id))
+        if pos < len(self.ids) and self.ids[pos] == quorum_id:
+            raise ValueError(f"quorum {quorum_id} is already on the ring")
+        if len(self.ids) == self.ring_size:
+            raise ValueError(f"the 2^{self.m} ring is full")
+        rows, cols = self._fingers_targeting(int(self.ids[pos - 1]), quorum_id)
+        self.fingers[rows, cols] = quorum_id
+        self.ids = np.insert(self.ids, pos, quorum_id)
+        offsets = np.left_shift(1, np.arange(self.m, dtype=np.int64))
+        own = self.ids[self.successor_index((quorum_id + offsets) % self.ring_size)]
+        self.fingers = np.insert(self.fingers, pos, own, axis=0)
+        rows = np.where(rows >= pos, rows + 1, rows)
+        return np.union1d(rows, [pos])
+
+    def leave(self, quorum_id):
+        # Fingers that pointed at the leaving quorum fall through to its
+        # successor. Returns the indices (after the removal) of the changed tables.
+        pos = self.index_of(quorum_id)
+        if pos == len(self.ids) or self.ids[pos] != quorum_id:
+            raise ValueError(f"quorum {quorum_id} is not on the ring")
+        if len(self.ids) == 1:
+            raise ValueError("the last quorum cannot leave the ring")
+        successor = self.ids[(pos + 1) % len(self.ids)]
+        rows, cols = self._fingers_targeting(int(self.ids[pos - 1]), quorum_id)
+        self.fingers[rows, cols] = successor
+        self.ids = np.delete(self.ids, pos)
+        self.fingers = np.delete(self.fingers, pos, axis=0)
+        rows = rows[rows != pos]
+        return np.unique(np.where(rows > pos, rows - 1, rows))
+
+    def index_of(self, quorum_id):
+        return int(np.searchsorted(self.ids, quorum_id))
+
+    def owner_index(self, key):
+        return int(self.successor_index(key % self.ring_size))
+
+    def closest_preceding_index(self, index, key):
+        node = self.ids[index]
+        distances = (self.fingers[index] - node) % self.ring_size
+        key_distance = (key - node) % self.ring_size
+        candidates = np.where((distances > 0) & (distances < key_distance), distances, -1)
+        best = int(candidates.argmax())
+        if candidates[best] < 0:
+            return index
+        return self.index_of(self.fingers[index, best])
+
+    def lookup_path(self, start_index, key):
+        # Iterative Chord find_successor; returns the quorum indices visited,
+        # ending with the quorum responsible for key.
+        key %= self.ring_size
+        path = [start_index]
+        if len(self.ids) == 1:
+            # A lone quorum owns the whole ring; its fingers all point back at it
+            return path
+        index = start_index
+        while True:
+            node = self.ids[index]
+            succ = (index + 1) % len(self.ids)
+            if node == key:
+                return path
+            if 0 < (key - node) % self.ring_size <= (self.ids[succ] - node) % self.ring_size:
+                path.append(succ)
+                return path
+            nxt = self.closest_preceding_index(index, key)
+            if nxt == index:
+                nxt = succ
+            path.append(nxt)
+            index = nxt
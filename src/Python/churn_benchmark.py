@@ -0,0 +1,112 @@
+import json
+import random
+import statistics
+import time
+
+import numpy as np
+
+from chord_ring import ChordRing
+from ring_simulation import RingLookupSimulator
+
+# Cost of a quorum join or leave with incremental finger maintenance, against
+# rebuilding every finger table and re-encoding every routing table, at the
+# largest Go configuration.
+NUM_QUORUMS = 25000
+RING_BITS = 19
+NUM_EVENTS = 200
+RESULTS_FILE = 'churn_results.json'
+# Ring churned down to a single quorum and back before timing anything
+CHECK_QUORUMS = 16
+CHECK_LOOKUPS = 50
+
+
+def full_rebuild(simulator):
+    start = time.perf_counter()
+    simulator.ring.fingers = simulator.ring.build_finger_tables()
+    fingers_time = time.perf_counter() - start
+    simulator.encode_all_routing_tables()
+    return fingers_time, time.perf_counter() - start
+
+
+def check_ring(ring, rng, num_lookups=CHECK_LOOKUPS):
+    if not np.array_equal(ring.fingers, ring.build_finger_tables()):
+        raise RuntimeError(f"incremental finger tables diverged from a full rebuild at {len(ring)} quorums")
+    for _ in range(num_lookups):
+        key = rng.randrange(ring.ring_size)
+        path = ring.lookup_path(rng.randrange(len(ring)), key)
+        if path[-1] != ring.owner_index(key) or len(path) > len(ring) + 1:
+            raise RuntimeError(f"lookup for {key} ended at the wrong quorum at {len(ring)} quorums")
+
+
+def check_churn_to_one(num_quorums=CHECK_QUORUMS, seed=None):
+    # Every quorum but one leaves, then the ring grows back; fingers and
+    # lookups must stay correct at every size, the single quorum included
+    rng = random.Random(seed)
+    ring = ChordRing(num_quorums, seed=seed)
+    while len(ring) > 1:
+        ring.leave(int(ring.ids[rng.randrange(len(ring))]))
+        check_ring(ring, rng)
+    try:
+        ring.leave(int(ring.ids[0]))
+    except ValueError:
+        pass
+    else:
+        raise RuntimeError("the last quorum left the ring")
+    while len(ring) < num_quorums:
+        quorum_id = rng.randrange(ring.ring_size)
+        if quorum_id not in ring.ids:
+            ring.join(quorum_id)
+            check_ring(ring, rng)
+
+
+def benchmark_churn(num_quorums=NUM_QUORUMS, m=RING_BITS, num_events=NUM_EVENTS, seed=None):
+    rng = random.Random(seed)
+    ring = ChordRing(num_quorums, m=m, seed=seed)
+    simulator = RingLookupSimulator(ring)
+    simulator.encode_all_routing_tables()
+    rebuild_fingers, rebuild_total = full_rebuild(simulator)
+
+    event_times, finger_times, changed_counts = [], [], []
+    for event in range(num_events):
+        if event % 2:
+            quorum_id = int(ring.ids[rng.randrange(len(ring))])
+            simulator.forget(quorum_id)
+            start = time.perf_counter()
+            changed = ring.leave(quorum_id)
+        else:
+            quorum_id = rng.randrange(ring.ring_size)
+            while quorum_id in simulator.routing_tables:
+                quorum_id = rng.randrange(ring.ring_size)
+            start = time.perf_counter()
+            changed = ring.join(quorum_id)
+        finger_times.append(time.perf_counter() - start)
+        simulator.reencode(changed)
+        event_times.append(time.perf_counter() - start)
+        changed_counts.append(len(changed))
+
+    if not np.array_equal(ring.fingers, ring.build_finger_tables()):
+        raise RuntimeError("incremental finger tables diverged from a full rebuild")
+    return {
+        'num_quorums': num_quorums,
+        'm': ring.m,
+        'num_events': num_events,
+        'mean_changed_tables': statistics.fmean(changed_counts),
+        'max_changed_tables': max(changed_counts),
+        'event_time_ms': statistics.median(event_times) * 1e3,
+        'event_finger_time_ms': statistics.median(finger_times) * 1e3,
+        'rebuild_finger_time_ms': rebuild_fingers * 1e3,
+        'rebuild_time_ms': rebuild_total * 1e3,
+    }
+
+
+if __name__ == "__main__":
+    check_churn_to_one()
+    result = benchmark_churn()
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(result, f, indent=4)
+    print(f"\nChurn at {result['num_quorums']} quorums (m = {result['m']}, {result['num_events']} joins/leaves):")
+    print(f"  Tables changed per event: {result['mean_changed_tables']:.1f} (max {result['max_changed_tables']})")
+    print(f"  Incremental update: {result['event_time_ms']:.3f} ms per event "
+          f"(fingers only {result['event_finger_time_ms']:.3f} ms)")
+    print(f"  Full rebuild: {result['rebuild_time_ms']:.3f} ms (fingers only {result['rebuild_finger_time_ms']:.3f} ms)")
+    print(f"  Speedup: {result['rebuild_time_ms'] / result['event_time_ms']:.0f}x")
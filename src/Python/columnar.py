@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+
+from results_stream import LEGACY_FILES, LEGACY_PROTOCOL, PHASES, read_records, record_protocol
+
+# Benchmark samples as four parallel columns (phase, group, run, value) in an
+# uncompressed .npz. group is sQ for the Python runs and num_quorums for the
+# Go routing-table benchmark; phase is an index into the stored phase names.
+# protocol is the signing protocol the runs were timed under, None for the Go
+# results.
+PERCENTILES = (50, 95, 99)
+
+
+class ResultTable:
+    def __init__(self, phases, phase, group, run, value, group_name='sQ', protocol=None):
+        self.phases = list(phases)
+        self.phase = np.asarray(phase, dtype=np.int16)
+        self.group = np.asarray(group, dtype=np.int64)
+        self.run = np.asarray(run, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.group_name = group_name
+        self.protocol = protocol
+
+    def __len__(self):
+        return len(self.value)
+
+    @classmethod
+    def from_rows(cls, rows, phases, group_name='sQ', protocol=None):
+        # rows of (phase name, group, run, value)
+        codes = {name: i for i, name in enumerate(phases)}
+        columns = list(zip(*rows)) or [(), (), (), ()]
+        return cls(phases, [codes[name] for name in columns[0]], columns[1], columns[2], columns[3], group_name,
+                   protocol)
+
+    @classmethod
+    def from_records(cls, records, phases=PHASES):
+        # Per-run records as written by ResultWriter
+        records = list(records)
+        return cls.from_rows(((phase, record['sQ'], record['run'], record[phase])
+                              for record in records for phase in phases if phase in record), phases,
+                             protocol=record_protocol(records))
+
+    def save(self, path):
+        np.savez(path, phases=np.array(self.phases), phase=self.phase, group=self.group, run=self.run,
+                 value=self.value, group_name=np.array(self.group_name), protocol=np.array(self.protocol or ''))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            # Files saved before the protocol was stored hold records without one
+            protocol = str(data['protocol']) if 'protocol' in data.files else LEGACY_PROTOCOL
+            return cls(data['phases'].tolist(), data['phase'], data['group'], data['run'], data['value'],
+                       str(data['group_name']), protocol or None)
+
+    def groups(self, phase):
+        return np.unique(self.group[self.phase == self.phases.index(phase)])
+
+    def values(self, phase, group):
+        return self.value[(self.phase == self.phases.index(phase)) & (self.group == group)]
+
+    def aggregate(self, phase, percentiles=PERCENTILES):
+        # Per-group count, mean, std (population, like np.std) and linearly
+        # interpolated percentiles, all without a Python loop over groups
+        mask = self.phase == self.phases.index(phase) if phase in self.phases else np.zeros(len(self), bool)
+        if not mask.any():
+            empty = np.empty(0)
+            return {'groups': np.empty(0, dtype=np.int64), 'count': np.empty(0, dtype=np.int64), 'mean': empty,
+                    'std': empty, **{f"p{q}": empty for q in percentiles}}
+        group = self.group[mask]
+        value = self.value[mask]
+        order = np.lexsort((value, group))
+        group = group[order]
+        value = value[order]
+        groups, starts, counts = np.unique(group, return_index=True, return_counts=True)
+        sums = np.add.reduceat(value, starts)
+        mean = sums / counts
+        squares = np.add.reduceat((value - np.repeat(mean, counts)) ** 2, starts)
+        result = {'groups': groups, 'count': counts, 'mean': mean, 'std': np.sqrt(squares / counts)}
+        for q in percentiles:
+            position = (counts - 1) * q / 100
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, counts - 1)
+            low = value[starts + lower]
+            high = value[starts + upper]
+            result[f"p{q}"] = low + (high - low) * (position - lower)
+        return result
+
+
+def import_stream(path):
+    return ResultTable.from_records(read_records(path))
+
+
+def import_legacy_json(directory='.'):
+    # The {sQ: {phase: [values]}} files written by export_legacy_json
+    rows = []
+    for phase, filename in LEGACY_FILES.items():
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        for sQ, phases in data.items():
+            rows.extend((phase, int(sQ), run, value) for run, value in enumerate(phases.get(phase, [])))
+    return ResultTable.from_rows(rows, PHASES, protocol=LEGACY_PROTOCOL)
+
+
+def import_go_results(path):
+    # benchmark_results.json from src/Go/main.go (or src/Python/rs_benchmark.py)
+    phases = ['encoding_time_ms', 'decoding_time_ms']
+    with open(path) as f:
+        entries = json.load(f)
+    # Other .json files (the legacy per-phase exports, netsim or cache
+    # results) would otherwise fail with a bare KeyError or TypeError
+    keys = {'num_quorums', *phases}
+    if not isinstance(entries, list) or not all(isinstance(e, dict) and keys <= e.keys() for e in entries):
+        raise ValueError(f"{path} is not a Go benchmark_results.json: expected a list of entries with "
+                         f"{', '.join(sorted(keys))}")
+    rows = []
+    seen = {}
+    for entry in entries:
+        run = seen.get(entry['num_quorums'], 0)
+        seen[entry['num_quorums']] = run + 1
+        rows.extend((phase, entry['num_quorums'], run, entry[phase]) for phase in phases)
+    return ResultTable.from_rows(rows, phases, group_name='num_quorums')
+
+
+def load_results(stream='performance.jsonl', columnar='performance.npz', directory='.'):
+    # Prefer the columnar file, then the record stream, then the legacy JSON
+    if os.path.exists(os.path.join(directory, columnar)):
+        return ResultTable.load(os.path.join(directory, columnar))
+    if os.path.exists(os.path.join(directory, stream)):
+        return import_stream(os.path.join(directory, stream))
+    return import_legacy_json(directory)
+
+
+def load_path(path):
+    # A .npz, a record stream, a Go benchmark_results.json, or a directory
+    # holding a stream, a .npz or the legacy JSON
+    if os.path.isdir(path):
+        return load_results(directory=path)
+    if path.endswith('.npz'):
+        return ResultTable.load(path)
+    if path.endswith('.json'):
+        return import_go_results(path)
+    return import_stream(path)
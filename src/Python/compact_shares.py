@@ -0,0 +1,49 @@
+from collections.abc import Sequence
+
+# Fixed-width packed encodings for per-peer key material: one bytes buffer per
+# quorum instead of a Python int (or a tuple of two) per peer.
+SCALAR_BYTES = 32
+
+
+class ScalarArray(Sequence):
+    # Integers below 2^256 as 32-byte big-endian words
+    __slots__ = ('data',)
+
+    def __init__(self, values):
+        self.data = b''.join(v.to_bytes(SCALAR_BYTES, 'big') for v in values)
+
+    def __len__(self):
+        return len(self.data) // SCALAR_BYTES
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return int.from_bytes(self.data[i * SCALAR_BYTES:(i + 1) * SCALAR_BYTES], 'big')
+
+
+class PointArray(Sequence):
+    # Affine points as x || y, 64 bytes each; all zeros stands for None
+    __slots__ = ('data',)
+    WIDTH = 2 * SCALAR_BYTES
+
+    def __init__(self, points):
+        self.data = b''.join(bytes(self.WIDTH) if p is None
+                             else p[0].to_bytes(SCALAR_BYTES, 'big') + p[1].to_bytes(SCALAR_BYTES, 'big')
+                             for p in points)
+
+    def __len__(self):
+        return len(self.data) // self.WIDTH
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        start = i * self.WIDTH
+        x = int.from_bytes(self.data[start:start + SCALAR_BYTES], 'big')
+        y = int.from_bytes(self.data[start + SCALAR_BYTES:start + self.WIDTH], 'big')
+        if not x and not y:
+            return None
+        return (x, y)
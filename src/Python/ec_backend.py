@@ -0,0 +1,351 @@
+import os
+
+from ec_point_operation import add as demo_add, curve, scalar_multiply as demo_scalar_multiply
+from fixed_base import WINDOW_BITS, generator_table
+from instrumentation import count, span
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# Points cross the backend boundary as affine (x, y) tuples of ints, with
+# None for the point at infinity, exactly like the demo library.
+
+
+class DemoBackend:
+    # The external threshold-signature-demo arithmetic (affine coordinates,
+    # one inversion per addition) plus the fixed-base generator table.
+    name = 'demo'
+
+    def prepare(self, cache_path=None):
+        generator_table(cache_path)
+
+    def multiply_g(self, k):
+        return generator_table().multiply(k)
+
+    def multiply(self, k, point):
+        return demo_scalar_multiply(k, point)
+
+    def add(self, p, q):
+        return demo_add(p, q)
+
+    def multi_multiply(self, scalars, points):
+        # Shamir's trick: one shared doubling chain over all the terms
+        terms = [(k % curve.n, point) for k, point in zip(scalars, points) if k % curve.n and point is not None]
+        if not terms:
+            return None
+        result = None
+        for bit in range(max(k.bit_length() for k, _ in terms) - 1, -1, -1):
+            result = demo_add(result, result)
+            for k, point in terms:
+                if k >> bit & 1:
+                    result = demo_add(result, point)
+        return result
+
+
+class JacobianBackend:
+    # secp256k1 (a = 0) in Jacobian coordinates: no inversion until the final
+    # conversion back to affine. Variable-base multiplication uses width-5
+    # wNAF, the generator uses a windowed table of affine points, and
+    # coordinates are gmpy2 mpz values when gmpy2 is installed.
+    name = 'jacobian'
+    WNAF_WIDTH = 5
+    # Below this many terms interleaved wNAF (Straus) beats bucketing
+    PIPPENGER_THRESHOLD = 32
+
+    def __init__(self):
+        self.num = gmpy2.mpz if gmpy2 is not None else int
+        self.p = self.num(curve.p)
+        self.n = curve.n
+        self.rows = None
+
+    def _inverse(self, a):
+        if gmpy2 is not None:
+            return gmpy2.invert(a, self.p)
+        return pow(a, -1, self.p)
+
+    def _double(self, P):
+        X, Y, Z = P
+        if not Z or not Y:
+            return (0, 1, 0)
+        p = self.p
+        A = X * X % p
+        B = Y * Y % p
+        C = B * B % p
+        D = 2 * ((X + B) * (X + B) - A - C) % p
+        E = 3 * A % p
+        X3 = (E * E - 2 * D) % p
+        Y3 = (E * (D - X3) - 8 * C) % p
+        Z3 = 2 * Y * Z % p
+        return (X3, Y3, Z3)
+
+    def _add(self, P, Q):
+        if not P[2]:
+            return Q
+        if not Q[2]:
+            return P
+        p = self.p
+        X1, Y1, Z1 = P
+        X2, Y2, Z2 = Q
+        Z1Z1 = Z1 * Z1 % p
+        Z2Z2 = Z2 * Z2 % p
+        U1 = X1 * Z2Z2 % p
+        U2 = X2 * Z1Z1 % p
+        S1 = Y1 * Z2 * Z2Z2 % p
+        S2 = Y2 * Z1 * Z1Z1 % p
+        H = (U2 - U1) % p
+        R = (S2 - S1) % p
+        if not H:
+            return self._double(P) if not R else (0, 1, 0)
+        H2 = H * H % p
+        H3 = H * H2 % p
+        U1H2 = U1 * H2 % p
+        X3 = (R * R - H3 - 2 * U1H2) % p
+        Y3 = (R * (U1H2 - X3) - S1 * H3) % p
+        Z3 = H * Z1 * Z2 % p
+        return (X3, Y3, Z3)
+
+    def _add_affine(self, P, x2, y2):
+        # Mixed addition with an affine second operand (Z2 = 1)
+        if not P[2]:
+            return (x2, y2, 1)
+        p = self.p
+        X1, Y1, Z1 = P
+        Z1Z1 = Z1 * Z1 % p
+        U2 = x2 * Z1Z1 % p
+        S2 = y2 * Z1 * Z1Z1 % p
+        H = (U2 - X1) % p
+        R = (S2 - Y1) % p
+        if not H:
+            return self._double(P) if not R else (0, 1, 0)
+        H2 = H * H % p
+        H3 = H * H2 % p
+        U1H2 = X1 * H2 % p
+        X3 = (R * R - H3 - 2 * U1H2) % p
+        Y3 = (R * (U1H2 - X3) - Y1 * H3) % p
+        Z3 = H * Z1 % p
+        return (X3, Y3, Z3)
+
+    def _to_affine(self, P):
+        X, Y, Z = P
+        if not Z:
+            return None
+        z_inv = self._inverse(Z)
+        z_inv2 = z_inv * z_inv % self.p
+        return (int(X * z_inv2 % self.p), int(Y * z_inv2 * z_inv % self.p))
+
+    def _batch_to_affine(self, points):
+        # Montgomery's trick over the Z coordinates; infinity maps to None
+        p = self.p
+        prefix = []
+        acc = self.num(1)
+        for X, Y, Z in points:
+            prefix.append(acc)
+            if Z:
+                acc = acc * Z % p
+        inv = self._inverse(acc)
+        result = [None] * len(points)
+        for i in range(len(points) - 1, -1, -1):
+            X, Y, Z = points[i]
+            if not Z:
+                continue
+            z_inv = prefix[i] * inv % p
+            inv = inv * Z % p
+            z_inv2 = z_inv * z_inv % p
+            result[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+        return result
+
+    def _from_affine(self, point):
+        if point is None:
+            return (0, 1, 0)
+        return (self.num(point[0]), self.num(point[1]), self.num(1))
+
+    @staticmethod
+    def wnaf(k, width):
+        digits = []
+        half = 1 << (width - 1)
+        mask = (1 << width) - 1
+        while k:
+            if k & 1:
+                d = k & mask
+                if d >= half:
+                    d -= 1 << width
+                k -= d
+            else:
+                d = 0
+            digits.append(d)
+            k >>= 1
+        return digits
+
+    def prepare(self, cache_path=None):
+        # rows[j][d] = d * 2^(window*j) * G as affine points; cheap enough in
+        # Jacobian form (one inversion for the whole table) that it is not cached.
+        if self.rows is not None:
+            return
+        size = 1 << WINDOW_BITS
+        windows = -(-curve.n.bit_length() // WINDOW_BITS)
+        jacobian = []
+        base = self._from_affine(curve.g)
+        for _ in range(windows):
+            acc = (0, 1, 0)
+            for _ in range(size - 1):
+                acc = self._add(acc, base)
+                jacobian.append(acc)
+            base = self._add(acc, base)
+        affine = self._batch_to_affine(jacobian)
+        self.rows = [[None] + affine[j * (size - 1):(j + 1) * (size - 1)] for j in range(windows)]
+
+    def multiply_g(self, k):
+        if self.rows is None:
+            self.prepare()
+        k %= self.n
+        mask = (1 << WINDOW_BITS) - 1
+        result = (0, 1, 0)
+        for row in self.rows:
+            if not k:
+                break
+            digit = k & mask
+            if digit:
+                x, y = row[digit]
+                result = self._add_affine(result, x, y)
+            k >>= WINDOW_BITS
+        return self._to_affine(result)
+
+    def _odd_multiples(self, point, count):
+        # point, 3*point, 5*point, ... as affine coordinates
+        P = self._from_affine(point)
+        twice = self._double(P)
+        multiples = [P]
+        for _ in range(count - 1):
+            multiples.append(self._add(multiples[-1], twice))
+        return self._batch_to_affine(multiples)
+
+    def multiply(self, k, point):
+        k %= self.n
+        if not k or point is None:
+            return None
+        table = self._odd_multiples(point, 1 << (self.WNAF_WIDTH - 2))
+        p = self.p
+        result = (0, 1, 0)
+        for d in reversed(self.wnaf(k, self.WNAF_WIDTH)):
+            result = self._double(result)
+            if d > 0:
+                x, y = table[d >> 1]
+                result = self._add_affine(result, x, y)
+            elif d < 0:
+                x, y = table[(-d) >> 1]
+                result = self._add_affine(result, x, (p - y) % p)
+        return self._to_affine(result)
+
+    def add(self, p, q):
+        return self._to_affine(self._add(self._from_affine(p), self._from_affine(q)))
+
+    def multi_multiply(self, scalars, points):
+        terms = [(k % self.n, point) for k, point in zip(scalars, points) if k % self.n and point is not None]
+        if not terms:
+            return None
+        if len(terms) < self.PIPPENGER_THRESHOLD:
+            return self._to_affine(self._straus(terms))
+        return self._to_affine(self._pippenger(terms))
+
+    def _straus(self, terms):
+        # One shared doubling chain; each term adds its wNAF digits into it
+        width = self.WNAF_WIDTH
+        tables = []
+        digits = []
+        for k, point in terms:
+            tables.append(self._odd_multiples(point, 1 << (width - 2)))
+            digits.append(self.wnaf(k, width))
+        p = self.p
+        result = (0, 1, 0)
+        for i in range(max(len(d) for d in digits) - 1, -1, -1):
+            result = self._double(result)
+            for table, term_digits in zip(tables, digits):
+                if i >= len(term_digits):
+                    continue
+                d = term_digits[i]
+                if d > 0:
+                    x, y = table[d >> 1]
+                    result = self._add_affine(result, x, y)
+                elif d < 0:
+                    x, y = table[(-d) >> 1]
+                    result = self._add_affine(result, x, (p - y) % p)
+        return result
+
+    def _pippenger(self, terms):
+        # Bucket method: per c-bit window, drop each point into the bucket of
+        # its digit, then sum buckets with the running-sum trick.
+        c = max(2, (len(terms).bit_length() - 1) * 7 // 10 + 1)
+        affine = [(self.num(point[0]), self.num(point[1])) for _, point in terms]
+        scalars = [k for k, _ in terms]
+        mask = (1 << c) - 1
+        windows = -(-self.n.bit_length() // c)
+        result = (0, 1, 0)
+        for w in range(windows - 1, -1, -1):
+            for _ in range(c):
+                result = self._double(result)
+            shift = w * c
+            buckets = [(0, 1, 0)] * (1 << c)
+            for k, (x, y) in zip(scalars, affine):
+                digit = (k >> shift) & mask
+                if digit:
+                    buckets[digit] = self._add_affine(buckets[digit], x, y)
+            running = (0, 1, 0)
+            window_sum = (0, 1, 0)
+            for digit in range(mask, 0, -1):
+                running = self._add(running, buckets[digit])
+                window_sum = self._add(window_sum, running)
+            result = self._add(result, window_sum)
+        return result
+
+
+BACKENDS = {
+    DemoBackend.name: DemoBackend,
+    JacobianBackend.name: JacobianBackend,
+}
+
+_backend = None
+
+
+def set_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"unknown EC backend {name!r}, expected one of {sorted(BACKENDS)}")
+    _backend = BACKENDS[name]()
+    return _backend
+
+
+def backend():
+    if _backend is None:
+        set_backend(os.environ.get('NCDHT_EC_BACKEND', DemoBackend.name))
+    return _backend
+
+
+def prepare_backend(cache_path=None):
+    # Precompute generator tables before anything is timed
+    backend().prepare(cache_path)
+
+
+def multiply_g(k):
+    count('ec.multiply_g')
+    with span('ec.multiply_g'):
+        return backend().multiply_g(k)
+
+
+def multiply(k, point):
+    count('ec.scalar_multiply')
+    with span('ec.scalar_multiply'):
+        return backend().multiply(k, point)
+
+
+def add(p, q):
+    return backend().add(p, q)
+
+
+def multi_multiply(scalars, points):
+    # sum(k_i * P_i) in one pass
+    count('ec.multi_multiply')
+    count('ec.multi_multiply.terms', len(points))
+    with span('ec.multi_multiply'):
+        return backend().multi_multiply(scalars, points)
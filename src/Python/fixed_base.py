@@ -0,0 +1,79 @@
+import os
+import pickle
+
+from ec_point_operation import add, curve
+
+# Window width of the generator table: 2^WINDOW_BITS points per window,
+# so a full-width multiply costs one point addition per window.
+WINDOW_BITS = 8
+
+
+class FixedBaseTable:
+    def __init__(self, point, window=WINDOW_BITS):
+        self.point = point
+        self.window = window
+        self.windows = -(-curve.n.bit_length() // window)
+        self.rows = self._build()
+
+    def _build(self):
+        # rows[j][d] = d * 2^(window*j) * point
+        rows = []
+        base = self.point
+        for _ in range(self.windows):
+            row = [None]
+            acc = None
+            for _ in range((1 << self.window) - 1):
+                acc = add(acc, base)
+                row.append(acc)
+            rows.append(row)
+            base = add(row[-1], base)
+        return rows
+
+    def multiply(self, k):
+        k %= curve.n
+        mask = (1 << self.window) - 1
+        result = None
+        for row in self.rows:
+            if not k:
+                break
+            digit = k & mask
+            if digit:
+                result = add(result, row[digit])
+            k >>= self.window
+        return result
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump((self.point, self.window, self.rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, point, window=WINDOW_BITS):
+        with open(path, 'rb') as f:
+            saved_point, saved_window, rows = pickle.load(f)
+        if tuple(saved_point) != tuple(point) or saved_window != window:
+            return None
+        table = cls.__new__(cls)
+        table.point = point
+        table.window = window
+        table.windows = len(rows)
+        table.rows = rows
+        return table
+
+
+_generator_table = None
+
+
+def generator_table(cache_path=None):
+    # Built once per process; with cache_path the table is read from (or
+    # written to) disk so later processes skip the build entirely.
+    global _generator_table
+    if _generator_table is None:
+        table = None
+        if cache_path and os.path.exists(cache_path):
+            table = FixedBaseTable.load(cache_path, curve.g)
+        if table is None:
+            table = FixedBaseTable(curve.g)
+            if cache_path:
+                table.save(cache_path)
+        _generator_table = table
+    return _generator_table
@@ -0,0 +1,130 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+
+# Everything here is switched on from the environment, no code edits needed:
+#   NCDHT_TRACE=1                record span timings and counters
+#   NCDHT_PROFILE=sign,verify    cProfile the listed spans ("all" for every span)
+#   NCDHT_TRACEMALLOC=1          track net and peak allocations per span
+# Spans always measure their own duration so callers can use span.elapsed
+# for the phase timings they return; recording only happens when enabled.
+
+
+class Span:
+    __slots__ = ('owner', 'name', 'start', 'elapsed', 'profiler', 'memory')
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.elapsed = 0.0
+        self.profiler = None
+        self.memory = None
+
+    def __enter__(self):
+        if self.owner.enabled:
+            self.owner._enter(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ns = time.perf_counter_ns() - self.start
+        self.elapsed = elapsed_ns / 1e9
+        if self.owner.enabled:
+            self.owner._exit(self, elapsed_ns)
+        return False
+
+
+class Instrumentation:
+    def __init__(self, enabled=False, profile=(), track_allocations=False):
+        self.enabled = enabled or bool(profile) or track_allocations
+        self.profile = set(profile)
+        self.track_allocations = track_allocations
+        self.reset()
+
+    @classmethod
+    def from_env(cls):
+        profile = [p.strip() for p in os.environ.get('NCDHT_PROFILE', '').split(',') if p.strip()]
+        return cls(enabled=os.environ.get('NCDHT_TRACE', '') not in ('', '0'),
+                   profile=profile,
+                   track_allocations=os.environ.get('NCDHT_TRACEMALLOC', '') not in ('', '0'))
+
+    def reset(self):
+        self.spans = defaultdict(list)
+        self.counters = defaultdict(int)
+        self.allocations = defaultdict(lambda: [0, 0])
+        self.profiles = {}
+        self._active_profiler = None
+        self._memory_stack = []
+
+    def span(self, name):
+        return Span(self, name)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def _enter(self, span):
+        if self._active_profiler is None and ('all' in self.profile or span.name in self.profile):
+            span.profiler = self.profiles.setdefault(span.name, cProfile.Profile())
+            self._active_profiler = span.profiler
+            span.profiler.enable()
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            # Nested spans reset the peak counter, so fold what the parent has
+            # seen so far into its running peak first.
+            if self._memory_stack:
+                parent = self._memory_stack[-1]
+                parent[1] = max(parent[1], peak)
+            tracemalloc.reset_peak()
+            span.memory = [current, current]
+            self._memory_stack.append(span.memory)
+
+    def _exit(self, span, elapsed_ns):
+        if span.profiler is not None:
+            span.profiler.disable()
+            self._active_profiler = None
+        self.spans[span.name].append(elapsed_ns)
+        if span.memory is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            start, running_peak = self._memory_stack.pop()
+            peak = max(peak, running_peak)
+            totals = self.allocations[span.name]
+            totals[0] += current - start
+            totals[1] = max(totals[1], peak - start)
+            if self._memory_stack:
+                parent = self._memory_stack[-1]
+                parent[1] = max(parent[1], peak)
+
+    def report(self, profile_lines=15):
+        lines = []
+        if self.spans:
+            lines.append(f"{'span':<28}{'calls':>8}{'total ms':>14}{'mean ms':>12}"
+                         + (f"{'net KiB':>12}{'peak KiB':>12}" if self.allocations else ''))
+            for name, samples in sorted(self.spans.items(), key=lambda kv: -sum(kv[1])):
+                total = sum(samples) / 1e6
+                line = f"{name:<28}{len(samples):>8}{total:>14.3f}{total / len(samples):>12.4f}"
+                if name in self.allocations:
+                    net, peak = self.allocations[name]
+                    line += f"{net / 1024:>12.1f}{peak / 1024:>12.1f}"
+                lines.append(line)
+        if self.counters:
+            lines.append('')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<28}{value:>8}")
+        for name, profiler in self.profiles.items():
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(profile_lines)
+            lines.append(f"\nProfile for span '{name}':")
+            lines.append(out.getvalue())
+        return '\n'.join(lines)
+
+
+instrumentation = Instrumentation.from_env()
+span = instrumentation.span
+count = instrumentation.count
@@ -0,0 +1,107 @@
+import json
+import os
+import random
+from collections import OrderedDict
+
+from threshold_signature import ThresholdSignature
+from ec_backend import multiply_g
+from instrumentation import span
+
+
+class QuorumMaterial:
+    def __init__(self, public_key, shares, public_key_shares, keygen_time):
+        self.public_key = public_key
+        self.shares = shares
+        self.public_key_shares = public_key_shares
+        self.keygen_time = keygen_time
+
+    def to_json(self):
+        return {
+            'public_key': list(self.public_key),
+            'shares': self.shares,
+            'public_key_shares': [list(p) for p in self.public_key_shares],
+            'keygen_time': self.keygen_time,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(tuple(data['public_key']), data['shares'],
+                   [tuple(p) for p in data['public_key_shares']], data['keygen_time'])
+
+
+def generate_material(sQ, threshold, seed=None):
+    # The seed only makes keygen repeatable if the demo library draws from
+    # the `random` module; either way it names the cache slot. Without one
+    # the keys come from the current random state, which advances as usual.
+    state = random.getstate() if seed is not None else None
+    if seed is not None:
+        random.seed(f"{sQ}:{threshold}:{seed}")
+    try:
+        with span('keygen') as timer:
+            ts_instance = ThresholdSignature(group_size=sQ, threshold=threshold)
+    finally:
+        if state is not None:
+            random.setstate(state)
+    with span('keygen.public_shares'):
+        public_key_shares = [multiply_g(s) for s in ts_instance.shares]
+    return QuorumMaterial(ts_instance.public_key, list(ts_instance.shares), public_key_shares, timer.elapsed)
+
+
+class QuorumMaterialCache:
+    # cache_dir keeps material on disk for later processes, as plain JSON
+    # that includes the private key shares, so files are created owner-only
+    # (0600). It may be a callable, looked up on every get, so the directory
+    # can be chosen after the cache is created.
+    def __init__(self, maxsize=16, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _cache_dir(self):
+        return self.cache_dir() if callable(self.cache_dir) else self.cache_dir
+
+    def _path(self, cache_dir, key):
+        return os.path.join(cache_dir, "quorum_{}_{}_{}.json".format(*key))
+
+    def _remember(self, key, material):
+        self.entries[key] = material
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def put(self, sQ, threshold, seed, material):
+        self._remember((sQ, threshold, seed), material)
+
+    def get(self, sQ, threshold, seed=0, fresh=False):
+        # Returns (material, generated); generated is True only when keygen
+        # actually ran for this call, so callers know whether to time it.
+        # fresh draws new keys from the current random state and leaves the
+        # cached slot alone.
+        if fresh:
+            self.misses += 1
+            return generate_material(sQ, threshold), True
+        key = (sQ, threshold, seed)
+        cache_dir = self._cache_dir()
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key], False
+        if cache_dir and os.path.exists(self._path(cache_dir, key)):
+            with open(self._path(cache_dir, key)) as f:
+                material = QuorumMaterial.from_json(json.load(f))
+            self.disk_hits += 1
+            self._remember(key, material)
+            return material, False
+        self.misses += 1
+        material = generate_material(sQ, threshold, seed)
+        self._remember(key, material)
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            tmp_path = self._path(cache_dir, key) + '.tmp'
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+                json.dump(material.to_json(), f)
+            os.replace(tmp_path, self._path(cache_dir, key))
+        return material, True
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from operator import mul
+
+from ec_point_operation import curve
+from instrumentation import count, span
+
+# Up to this many signers each Lagrange denominator is inverted on its own:
+# they stay well below the group order, where pow(den, -1, n) is cheap, and
+# one batched inversion of their wrapped product costs more
+DIRECT_INVERSE_MAX = 8
+
+
+def batch_inverse(values, modulus):
+    # Montgomery's trick: one modular inversion for the whole list.
+    prefix = []
+    acc = 1
+    for v in values:
+        prefix.append(acc)
+        acc = acc * v % modulus
+    inv = pow(acc, -1, modulus)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        result[i] = prefix[i] * inv % modulus
+        inv = inv * values[i] % modulus
+    return result
+
+
+def lagrange_coefficients_at_zero(xs, modulus=curve.n):
+    # lambda_i = prod_{j != i} x_j / (x_j - x_i). The x-coordinates are small
+    # peer indices, so the products are taken over plain integers and only
+    # reduced for the inversion.
+    total = 1
+    for x in xs:
+        total *= x
+    denominators = []
+    for xi in xs:
+        den = xi
+        for xj in xs:
+            if xj != xi:
+                den *= xj - xi
+        denominators.append(den)
+    if len(xs) <= DIRECT_INVERSE_MAX:
+        # Denominators this small invert faster one by one than batched
+        return [total * pow(den, -1, modulus) % modulus for den in denominators]
+    inverses = batch_inverse([den % modulus for den in denominators], modulus)
+    return [total * inv % modulus for inv in inverses]
+
+
+class CombineEngine:
+    # Shared by every quorum, also from the async driver's threads. Each dict
+    # call is atomic; only a set evicted between get and move_to_end needs
+    # handling, and the coefficients already in hand are still right.
+    def __init__(self, maxsize=256, modulus=curve.n):
+        self.maxsize = maxsize
+        self.modulus = modulus
+        self.coefficient_sets = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def coefficients(self, xs):
+        # Keyed on the sorted signer set so the signing order doesn't matter
+        key = tuple(sorted(xs))
+        coeffs = self.coefficient_sets.get(key)
+        if coeffs is not None:
+            self.hits += 1
+            count('lagrange.hit')
+            self._touch(key)
+            return coeffs
+        return dict(zip(xs, self._miss(key, xs)))
+
+    def _touch(self, key):
+        try:
+            self.coefficient_sets.move_to_end(key)
+        except KeyError:
+            pass
+
+    def _miss(self, key, xs):
+        # Coefficients as a plain list in the order of xs, cached for the next
+        # round with the same signers
+        self.misses += 1
+        count('lagrange.miss')
+        coeffs = lagrange_coefficients_at_zero(xs, self.modulus)
+        if self.maxsize:
+            self.coefficient_sets[key] = dict(zip(xs, coeffs))
+            while len(self.coefficient_sets) > self.maxsize:
+                self.coefficient_sets.popitem(last=False)
+        return coeffs
+
+    def combine(self, xs, ys):
+        key = tuple(sorted(xs))
+        coeffs = self.coefficient_sets.get(key)
+        if coeffs is None:
+            # A miss costs one interpolation and nothing else, no worse than
+            # Polynomial.interpolate_evaluate on a single signer set
+            coeffs = self._miss(key, xs)
+            return sum(map(mul, coeffs, ys)) % self.modulus
+        self.hits += 1
+        count('lagrange.hit')
+        self._touch(key)
+        return sum(coeffs[x] * y for x, y in zip(xs, ys)) % self.modulus
+
+
+# Coefficients depend only on the signer x-coordinates, so all quorums share one engine
+default_engine = CombineEngine()
@@ -0,0 +1,63 @@
+import json
+import random
+import tracemalloc
+
+from main import CompactQuorum, Quorum
+from keygen_cache import QuorumMaterial
+from ec_point_operation import curve
+
+# Bytes per peer held by a ring of quorums with the per-peer Peer objects
+# versus CompactQuorum's packed buffers and on-demand peer views.
+NUM_QUORUMS = 1000
+QUORUM_SIZES = [10, 100, 150]
+RESULTS_FILE = 'memory_results.json'
+
+
+class SyntheticMaterialCache:
+    # Distinct, random-valued key material per quorum without running keygen:
+    # what is measured is how it is stored, not whether it is a valid sharing
+    def get(self, sQ, threshold, seed=0, fresh=False):
+        def scalar():
+            return random.randrange(1, curve.n)
+        point = (scalar(), scalar())
+        return QuorumMaterial(point, [scalar() for _ in range(sQ)],
+                              [(scalar(), scalar()) for _ in range(sQ)], 0.0), False
+
+
+def measure(quorum_class, num_quorums, sQ):
+    cache = SyntheticMaterialCache()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    quorums = [quorum_class(str(i), sQ, sQ // 3, cache=cache) for i in range(num_quorums)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del quorums
+    peers = num_quorums * sQ
+    return (current - before) / peers, (peak - before) / peers
+
+
+def benchmark_memory(num_quorums=NUM_QUORUMS, quorum_sizes=QUORUM_SIZES):
+    results = []
+    for sQ in quorum_sizes:
+        objects, objects_peak = measure(Quorum, num_quorums, sQ)
+        compact, compact_peak = measure(CompactQuorum, num_quorums, sQ)
+        results.append({
+            'num_quorums': num_quorums,
+            'sQ': sQ,
+            'bytes_per_peer': objects,
+            'compact_bytes_per_peer': compact,
+            'peak_bytes_per_peer': objects_peak,
+            'compact_peak_bytes_per_peer': compact_peak,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark_memory()
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"\nMemory per peer over {NUM_QUORUMS} quorums (tracemalloc):")
+    for row in results:
+        ratio = row['bytes_per_peer'] / row['compact_bytes_per_peer']
+        print(f"sQ = {row['sQ']}: Peer objects {row['bytes_per_peer']:.0f} B, "
+              f"compact {row['compact_bytes_per_peer']:.0f} B ({ratio:.1f}x smaller)")
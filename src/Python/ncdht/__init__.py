@@ -0,0 +1,29 @@
+import importlib.util
+import os
+import sys
+
+# The benchmark modules ncdht builds on (keygen_cache, signing, ...) sit next
+# to the package in src/Python and are imported as top-level modules, so
+# src/Python has to be on sys.path: run python -m ncdht from there, or set
+# PYTHONPATH=src/Python anywhere else
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Checkout of gitzhou/threshold-signature-demo, which provides the curve,
+# polynomial and ThresholdSignature modules the benchmarks build on; by
+# default cloned into src/Python, wherever the benchmarks are run from
+DEMO_PATH = os.environ.get('NCDHT_DEMO_PATH') or os.path.join(SOURCE_DIR, 'threshold-signature-demo')
+
+
+def use_demo_library(path=DEMO_PATH):
+    # Called once by entry points before anything imports the benchmark code;
+    # importing ncdht itself leaves sys.path alone
+    if importlib.util.find_spec('keygen_cache') is None:
+        raise ImportError(f"the ncdht benchmark modules are not importable; run from {SOURCE_DIR} "
+                          f"or add it to PYTHONPATH")
+    path = os.path.abspath(path)
+    if path not in sys.path:
+        sys.path.append(path)
+    if importlib.util.find_spec('ec_point_operation') is None:
+        raise ImportError(f"threshold-signature-demo not found at {path}; clone it there, "
+                          f"or set NCDHT_DEMO_PATH or --demo-path")
+    return path
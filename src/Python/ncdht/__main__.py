@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+
+from . import DEMO_PATH, use_demo_library
+
+# python -m ncdht sweep|plot|compare. Each subcommand imports what it needs
+# when it runs, so a sweep never loads matplotlib and, with --no-columnar,
+# never loads NumPy either. Options left unset fall back to the constants
+# in ncdht.benchmark, ncdht.sweep and ncdht.compare.
+
+
+def run_sweep(args):
+    use_demo_library(args.demo_path)
+    from . import benchmark
+    from .benchmark import (FRESH_KEYGEN, NUM_RUNS, PEER_COUNTS, RESULTS_STREAM, RESUME, SIGN_WORKERS,
+                            report_performance)
+    from .sweep import SWEEP_MODE, SWEEP_SEED, SWEEP_WORKERS, save_columnar, sweep
+    if args.no_verify_cache:
+        # Before any worker is forked, so the whole sweep verifies every signature
+        benchmark.VERIFY_CACHE = None
+    if args.quorum_cache_dir:
+        benchmark.QUORUM_CACHE_DIR = args.quorum_cache_dir
+    peer_counts = args.peer_counts or PEER_COUNTS
+    output = args.output or RESULTS_STREAM
+    sign_workers = SIGN_WORKERS if args.sign_workers is None else args.sign_workers
+    seed = SWEEP_SEED if args.seed is None else args.seed
+    performance = sweep(peer_counts, args.runs or NUM_RUNS, mode=args.mode or SWEEP_MODE,
+                        workers=args.workers or SWEEP_WORKERS, base_seed=seed, path=output,
+                        resume=args.resume or RESUME, sign_workers=sign_workers,
+                        fresh_keygen=args.fresh_keygen or FRESH_KEYGEN)
+    if not args.no_columnar:
+        save_columnar(output)
+    # The legacy per-phase JSON goes next to the record stream
+    report_performance(performance, peer_counts, os.path.dirname(output) or '.')
+    return 0
+
+
+def run_plot(args):
+    from columnar import load_path
+    from .plotting import plot_results
+    for filename in plot_results(load_path(args.input), args.style, args.prefix, args.output_dir):
+        print(filename)
+    return 0
+
+
+def run_compare(args):
+    from columnar import load_path
+    from .compare import ALPHA, GATED_PHASES, TOLERANCE, compare_results, format_table, regressions
+    tolerance = TOLERANCE if args.tolerance is None else args.tolerance
+    alpha = ALPHA if args.alpha is None else args.alpha
+    baseline = load_path(args.baseline)
+    candidate = load_path(args.candidate)
+    rows = compare_results(baseline, candidate, args.phases, tolerance, alpha, args.test, args.seed)
+    print(format_table(rows, baseline.group_name))
+    failed = regressions(rows, args.gate or GATED_PHASES)
+    speedups = sum(row['verdict'] == 'speedup' for row in rows)
+    untested = sum(row['verdict'] == 'insufficient data' for row in rows)
+    print(f"\n{len(failed)} regression(s), {speedups} speedup(s) beyond {tolerance:.0%} "
+          f"over {len(rows)} comparisons, {untested} with too few runs to test")
+    incomparable = sum(row['verdict'] == 'protocol changed' for row in rows)
+    if incomparable:
+        print(f"{incomparable} signing comparison(s) skipped: baseline signed with {baseline.protocol}, "
+              f"candidate with {candidate.protocol}")
+    # Non-zero exit fails the CI job on any gated regression
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m ncdht', description='NC-DHT threshold signature benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sweep = commands.add_parser('sweep', help='time keygen/sign/combine/verify over quorum sizes')
+    sweep.add_argument('--peer-counts', type=int, nargs='+', metavar='sQ')
+    sweep.add_argument('--runs', type=int)
+    sweep.add_argument('--output', help='JSON-lines record stream')
+    sweep.add_argument('--mode', choices=('parallel', 'hybrid', 'serial'), help='default: hybrid')
+    sweep.add_argument('--workers', type=int, help='keygen or job processes (default: one per core)')
+    sweep.add_argument('--sign-workers', type=int, help='also time signing with round 1 on a pool of this many processes '
+                                                            '(serial and hybrid mode)')
+    sweep.add_argument('--fresh-keygen', action='store_true', help='generate and time keygen on every run')
+    sweep.add_argument('--seed', type=int, help='base seed for every (sQ, run) job (default 0)')
+    sweep.add_argument('--resume', action='store_true', help='skip (sQ, run) pairs already in --output')
+    sweep.add_argument('--no-columnar', action='store_true', help='skip writing the .npz copy')
+    sweep.add_argument('--no-verify-cache', action='store_true', help='verify every signature, no caching')
+    sweep.add_argument('--quorum-cache-dir', help='keep generated key material (private shares included, '
+                                                  'owner-only files) here for later runs')
+    sweep.add_argument('--demo-path', default=DEMO_PATH, help='threshold-signature-demo checkout')
+    sweep.set_defaults(handler=run_sweep)
+
+    plot = commands.add_parser('plot', help='plot recorded results')
+    plot.add_argument('input', nargs='?', default='.', help='.npz, .jsonl, or a directory of results')
+    plot.add_argument('--style', choices=('bar', 'box'), default='bar')
+    plot.add_argument('--prefix', default='', help='prepended to the image file names')
+    plot.add_argument('--output-dir', default='.')
+    plot.set_defaults(handler=run_plot)
+
+    compare = commands.add_parser('compare', help='regression gate: compare a candidate run with a baseline')
+    compare.add_argument('baseline', help='.npz, .jsonl, Go .json, or a directory of results')
+    compare.add_argument('candidate', help='.npz, .jsonl, Go .json, or a directory of results')
+    compare.add_argument('--tolerance', type=float, help='relative median change allowed (default 0.05)')
+    compare.add_argument('--alpha', type=float, help='significance level (default 0.05)')
+    compare.add_argument('--test', choices=('mannwhitney', 'bootstrap'), default='mannwhitney')
+    compare.add_argument('--phases', nargs='+', help='phases to compare (default: all recorded on both sides)')
+    compare.add_argument('--gate', nargs='+', help='phases whose regressions fail the run '
+                                                   '(default: sign, combine, verify, encode, decode)')
+    compare.add_argument('--seed', type=int, default=0, help='bootstrap seed')
+    compare.set_defaults(handler=run_compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
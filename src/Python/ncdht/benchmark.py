@@ -0,0 +1,418 @@
+import os
+import time
+import random
+import uuid
+
+from ec_backend import prepare_backend
+from signing import (combine_nonce, corrupt_share, deal_presignature, nonce_commitment, presignature_commitment,
+                     sign_share, verify_signature)
+from batch_verify import batch_verify_shares, find_invalid
+from parallel_signing import SigningPool
+from nonce_pool import NoncePool
+from keygen_cache import QuorumMaterialCache, generate_material
+from resharing import reshare_material
+from lagrange import default_engine
+from results_stream import export_legacy_json
+from verify_cache import VerificationCache
+from compact_shares import PointArray, ScalarArray
+from instrumentation import instrumentation, span
+
+# Configuration for peer counts and number of runs
+PEER_COUNTS = [5, 10, 50, 100, 150]
+# PEER_COUNTS=[5,10,20,40,80,160]
+NUM_RUNS = 5
+# Worker processes for signing round 1 (the nonce commitments) in the
+# parallel signing mode; round 2 stays serial. 0 keeps signing serial only
+SIGN_WORKERS = 0
+# Optional file for the precomputed generator table so later runs skip the build;
+# the EC backend itself is chosen with NCDHT_EC_BACKEND (demo or jacobian)
+GENERATOR_TABLE_CACHE = None
+# Reuse quorum key material across runs; set FRESH_KEYGEN when keygen is being measured
+FRESH_KEYGEN = False
+# Directory that keeps key material (private shares included) across
+# processes; None keeps it in memory. Read on every lookup, so it can be set
+# after import, as python -m ncdht sweep --quorum-cache-dir does
+QUORUM_CACHE_DIR = os.environ.get('NCDHT_QUORUM_CACHE_DIR') or None
+QUORUM_CACHE = QuorumMaterialCache(cache_dir=lambda: QUORUM_CACHE_DIR)
+# One JSON record per run is appended here, with a columnar .npz copy next
+# to it for plotting; RESUME skips (sQ, run) pairs already recorded
+RESULTS_STREAM = 'performance.jsonl'
+RESUME = False
+# Fraction of peers per quorum that answer with corrupt signature shares
+BYZANTINE_FRACTION = 0.0
+# Presignatures dealt ahead of time per quorum, so the dealer's work is off
+# the lookup path. Off by default so sweeps stay comparable with the stored
+# results; nonce_pool_benchmark.py measures the pooled path on its own.
+# Either way the dealing time is recorded as nonce_times, never as sign_times.
+NONCE_POOL_SIZE = 0
+# Shared cache of verified signatures and lookup results for replayed or
+# forwarded answers; None (or --no-verify-cache) verifies every signature,
+# for pure crypto benchmarks. Initiators look it up when they are created
+# unless given their own cache, or cache=None for none.
+VERIFY_CACHE = VerificationCache()
+# Default for Initiator(cache=...), told apart from an explicit None
+SHARED_CACHE = object()
+
+class Peer:
+    def __init__(self, id, quorum_id, private_key_share, public_key_share, faulty=False):
+        self.id = id
+        self.quorum_id = quorum_id
+        self.private_key_share = private_key_share
+        self.public_key_share = public_key_share
+        self.faulty = faulty
+    
+    def commit_nonce(self, presignature_share):
+        return nonce_commitment(presignature_share)
+
+    def process_request(self, message, presignature_share, nonce):
+        if self.faulty:
+            return corrupt_share(nonce)
+        return sign_share(presignature_share, message.encode(), nonce)
+
+class Quorum:
+    def __init__(self, id, sQ, tQ, cache=None, seed=0, fresh_keygen=False, byzantine_fraction=0.0,
+                 nonce_pool_size=0):
+        self.id = id
+        self.sQ = sQ
+        self.tQ = tQ
+        if cache is not None:
+            material, generated = cache.get(sQ, tQ + 1, seed, fresh=fresh_keygen)
+        else:
+            material, generated = generate_material(sQ, tQ + 1), True
+        # None when the key material came from the cache and no keygen ran
+        self.keygen_time = material.keygen_time if generated else None
+        self.public_key = material.public_key
+        self.faulty = set(random.sample(range(sQ), int(round(byzantine_fraction * sQ))))
+        self.store_material(material)
+        self.signing_pool = None
+        self.owns_signing_pool = False
+        self.combine_engine = default_engine
+        self.nonce_pool_size = nonce_pool_size
+        self.nonce_pool = NoncePool(self.presign, nonce_pool_size) if nonce_pool_size else None
+        # Presignature of the last signing round, the dealer's time for it
+        # and whether the pool dealt it ahead of time; set by take_presignature
+        self.nonce_time = None
+        self.nonce_offline = False
+        self.presignature = None
+
+    def store_material(self, material):
+        self.private_key_shares = material.shares
+        self.public_key_shares = material.public_key_shares
+        self.peers = [Peer(i, self.id, self.private_key_shares[i], self.public_key_shares[i], i in self.faulty)
+                      for i in range(self.sQ)]
+
+    def reshare(self, leaving=(), joining=0, tQ=None):
+        # Membership or threshold change without a new keygen: t+1 honest
+        # remaining peers deal sub-shares of their shares to the new member
+        # set, which keeps the quorum public key. Remaining peers keep their
+        # order, joiners are appended. Returns the time taken.
+        leaving = set(leaving)
+        remaining = [i for i in range(self.sQ) if i not in leaving]
+        new_tQ = self.tQ if tQ is None else tQ
+        new_sQ = len(remaining) + joining
+        if new_tQ + 1 > new_sQ:
+            raise ValueError(f"threshold {new_tQ} needs more than {new_sQ} peers")
+        honest = [i for i in remaining if i not in self.faulty]
+        if len(honest) < self.tQ + 1:
+            raise ValueError(f"only {len(honest)} honest peers remain, {self.tQ + 1} needed to reshare")
+        material = reshare_material(self.private_key_shares, self.public_key, honest[:self.tQ + 1],
+                                    new_sQ, new_tQ + 1)
+        self.faulty = {new for new, old in enumerate(remaining) if old in self.faulty}
+        self.sQ = new_sQ
+        self.tQ = new_tQ
+        self.store_material(material)
+        # Pooled presignatures were dealt against the old shares
+        if self.nonce_pool is not None:
+            self.nonce_pool.close()
+            self.nonce_pool = NoncePool(self.presign, self.nonce_pool_size)
+        return material.keygen_time
+
+    def enable_parallel_signing(self, workers=None, pool=None):
+        # Workers only ever see nonce shares, so one pool can serve any number
+        # of quorums; a pool passed in stays open when the quorum closes
+        if pool is not None:
+            self.close_signing_pool()
+            self.signing_pool = pool
+        elif self.signing_pool is None:
+            self.signing_pool = SigningPool(workers, GENERATOR_TABLE_CACHE)
+            self.owns_signing_pool = True
+
+    def close_signing_pool(self):
+        if self.signing_pool is not None and self.owns_signing_pool:
+            self.signing_pool.close()
+        self.signing_pool = None
+        self.owns_signing_pool = False
+
+    def close(self):
+        self.close_signing_pool()
+        if self.nonce_pool is not None:
+            self.nonce_pool.close()
+            self.nonce_pool = None
+
+    def presign(self):
+        return deal_presignature(self.private_key_shares, self.tQ + 1)
+
+    def draw_presignature(self):
+        # Returns (presignature, dealer time, dealt offline) without touching
+        # the quorum's state, for lookups that run concurrently on one quorum
+        start = time.perf_counter()
+        if self.nonce_pool is not None:
+            presignature, offline_time = self.nonce_pool.take()
+        else:
+            presignature, offline_time = self.presign(), None
+        if offline_time is not None:
+            return presignature, offline_time, True
+        return presignature, time.perf_counter() - start, False
+
+    def take_presignature(self):
+        presignature, self.nonce_time, self.nonce_offline = self.draw_presignature()
+        self.presignature = presignature
+        return presignature
+
+    def collect_shares(self, signers, message, parallel=False, presignature=None):
+        # Two rounds over one presignature: every signer commits to its nonce
+        # share (R_i = k_i*G), R is interpolated from the commitments, then
+        # every signer answers with its signature share
+        if presignature is None:
+            presignature = self.take_presignature()
+        shares = [presignature[i] for i in signers]
+        if parallel:
+            commitments = self.signing_pool.commit(shares)
+        else:
+            commitments = [self.peers[i].commit_nonce(share) for i, share in zip(signers, shares)]
+        nonce = combine_nonce([i + 1 for i in signers], commitments)
+        signatures = []
+        for peer_id, share in zip(signers, shares):
+            peer = self.peers[peer_id]
+            sig = peer.process_request(message, share, nonce)
+            signatures.append(sig)
+        return signatures
+
+    def respond(self, message, num_signers, parallel=False):
+        available_peers = list(range(self.sQ))
+        signers = random.sample(available_peers, num_signers)
+        # Dealing is the dealer's work, timed separately from the signers'
+        presignature = self.take_presignature()
+        with span('sign.parallel' if parallel else 'sign') as timer:
+            signatures = self.collect_shares(signers, message, parallel, presignature)
+        sign_time = timer.elapsed
+        valid = all(sig is not None for sig in signatures)
+        return signatures, valid, signers, sign_time
+
+    def combine_shares(self, signatures, share_ids, message):
+        # (r, s, v) like signing.sign_recoverable: every share carries the
+        # nonce point's r and y parity, so the combined signature can go
+        # straight into batch_verify
+        with span('combine') as timer:
+            s = self.combine_engine.combine([i + 1 for i in share_ids], [sig[1] for sig in signatures])
+            r, _, v = signatures[0]
+        combine_time = timer.elapsed
+        return (r, s, v), combine_time
+
+    def recover(self, message, signatures, signers, presignature=None):
+        # Fallback once the optimistic combine failed to verify: batch-check the
+        # shares against the dealer's commitments, drop the signers that fail,
+        # fill up with spare peers and run a fresh signing round. presignature
+        # is the one the shares were made with, by default the last round's.
+        if presignature is None:
+            presignature = self.presignature
+        num_signers = len(signers)
+        excluded = set()
+        while True:
+            items = [(sig, presignature_commitment(presignature[i])) for sig, i in zip(signatures, signers)]
+            bad = {signers[i] for i in find_invalid(items, lambda batch: batch_verify_shares(message.encode(), batch))}
+            excluded |= bad
+            good = [i for i in signers if i not in bad]
+            spares = [i for i in range(self.sQ) if i not in excluded and i not in good]
+            if not bad or len(good) + len(spares) < num_signers:
+                return None, signers
+            signers = good + random.sample(spares, num_signers - len(good))
+            # Kept local: the async driver recovers concurrent lookups on one quorum
+            presignature, _, _ = self.draw_presignature()
+            signatures = self.collect_shares(signers, message, presignature=presignature)
+            combined_signature, _ = self.combine_shares(signatures, signers, message)
+            if verify_signature(self.public_key, message.encode(), combined_signature):
+                return combined_signature, signers
+
+class PeerView:
+    # Peer interface over a CompactQuorum's packed key material
+    __slots__ = ('quorum', 'id')
+
+    def __init__(self, quorum, id):
+        self.quorum = quorum
+        self.id = id
+
+    @property
+    def quorum_id(self):
+        return self.quorum.id
+
+    @property
+    def private_key_share(self):
+        return self.quorum.private_key_shares[self.id]
+
+    @property
+    def public_key_share(self):
+        return self.quorum.public_key_shares[self.id]
+
+    @property
+    def faulty(self):
+        return self.id in self.quorum.faulty
+
+    commit_nonce = Peer.commit_nonce
+    process_request = Peer.process_request
+
+class PeerViews:
+    # quorum.peers for a CompactQuorum: views are created on access, not stored
+    __slots__ = ('quorum',)
+
+    def __init__(self, quorum):
+        self.quorum = quorum
+
+    def __len__(self):
+        return self.quorum.sQ
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.quorum.sQ
+        if not 0 <= i < self.quorum.sQ:
+            raise IndexError(i)
+        return PeerView(self.quorum, i)
+
+    def __iter__(self):
+        return (PeerView(self.quorum, i) for i in range(self.quorum.sQ))
+
+class CompactQuorum(Quorum):
+    # Same behaviour as Quorum, but shares and public key shares live in two
+    # fixed-width byte buffers and there are no per-peer objects, for rings of
+    # many thousands of quorums
+    def store_material(self, material):
+        self.private_key_shares = ScalarArray(material.shares)
+        self.public_key_shares = PointArray(material.public_key_shares)
+        self.peers = PeerViews(self)
+
+class Initiator:
+    def __init__(self, quorum, sQ, tQ, cache=SHARED_CACHE):
+        self.quorum = quorum
+        self.cache = VERIFY_CACHE if cache is SHARED_CACHE else cache
+        self.sQ = sQ
+        self.tQ = tQ
+        self.id = str(uuid.uuid4())
+        self.peer = quorum.peers[0]
+        self.performance = {'keygen_times': [], 'sign_times': [], 'nonce_times': [], 'combine_times': [],
+                            'verify_times': [], 'recovery_times': []}
+    
+    def lookup(self, message=None):
+        # Pass message to replay an earlier request
+        if message is None:
+            message = f"REQUEST|{self.id}|{time.time()}"
+        if self.cache is not None and self.cache.lookup_result(self.quorum.public_key, message) is not None:
+            return True
+        if self.quorum.keygen_time is not None:
+            self.performance['keygen_times'].append(self.quorum.keygen_time)
+        signatures, valid, signers, sign_time = self.quorum.respond(message, num_signers=self.tQ + 1)
+        self.performance['sign_times'].append(sign_time)
+        self.performance['nonce_times'].append(self.quorum.nonce_time)
+        
+        if not valid:
+            return False
+        
+        valid_shares = signatures
+        combined_signature, combine_time = self.quorum.combine_shares(valid_shares, signers, message)
+        self.performance['combine_times'].append(combine_time)
+        with span('verify') as timer:
+            if self.cache is not None:
+                verified = self.cache.verify(self.quorum.public_key, message, combined_signature)
+            else:
+                verified = verify_signature(self.quorum.public_key, message.encode(), combined_signature)
+        verify_time = timer.elapsed
+        self.performance['verify_times'].append(verify_time)
+        
+        if not verified:
+            with span('recover') as timer:
+                combined_signature, signers = self.quorum.recover(message, signatures, signers)
+            self.performance['recovery_times'].append(timer.elapsed)
+            if combined_signature is None:
+                return False
+        
+        if self.cache is not None:
+            self.cache.remember_lookup(self.quorum.public_key, message, combined_signature)
+        return True
+
+def run_once(sQ, sign_workers=SIGN_WORKERS, fresh_keygen=FRESH_KEYGEN, signing_pool=None):
+    tQ = sQ // 3
+    # Build (or load) the generator table before anything is timed
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    quorum = Quorum("0", sQ, tQ, cache=QUORUM_CACHE, fresh_keygen=fresh_keygen,
+                    byzantine_fraction=BYZANTINE_FRACTION, nonce_pool_size=NONCE_POOL_SIZE)
+    try:
+        initiator = Initiator(quorum, sQ, tQ)
+        if not initiator.lookup():
+            return None
+        timings = {phase: values[0] for phase, values in initiator.performance.items() if values}
+        if sign_workers:
+            # Same t+1 signer count as the lookup, round 1 spread over the
+            # worker pool. Without a pool from the caller one is started (and
+            # its workers spawned) for this run alone.
+            quorum.enable_parallel_signing(sign_workers, signing_pool)
+            message = f"REQUEST|{initiator.id}|{time.time()}"
+            _, _, _, timings['parallel_sign_times'] = quorum.respond(message, tQ + 1, parallel=True)
+    finally:
+        quorum.close()
+    return timings
+
+def simulate(sQ, num_runs, sign_workers=SIGN_WORKERS, fresh_keygen=FRESH_KEYGEN):
+    performance = {'keygen_times': [], 'sign_times': [], 'nonce_times': [], 'combine_times': [],
+                   'verify_times': [], 'recovery_times': [], 'parallel_sign_times': []}
+    
+    signing_pool = SigningPool(sign_workers, GENERATOR_TABLE_CACHE) if sign_workers else None
+    try:
+        for _ in range(num_runs):
+            timings = run_once(sQ, sign_workers, fresh_keygen, signing_pool)
+            if timings is not None:
+                for phase, value in timings.items():
+                    performance[phase].append(value)
+    finally:
+        if signing_pool is not None:
+            signing_pool.close()
+    
+    return performance
+
+def report_performance(performance_data, peer_counts=PEER_COUNTS, directory='.'):
+    # Keep the per-phase JSON files for existing consumers
+    export_legacy_json(performance_data, directory)
+
+    # Print average in ms
+    print("\nAverage Times (in milliseconds) for each Number of Peers (sQ):")
+    for sQ in peer_counts:
+        if sQ not in performance_data:
+            continue
+        perf = performance_data[sQ]
+        avg_keygen = sum(perf['keygen_times']) / len(perf['keygen_times']) if perf['keygen_times'] else 0
+        avg_sign = sum(perf['sign_times']) / len(perf['sign_times']) if perf['sign_times'] else 0
+        avg_combine = sum(perf['combine_times']) / len(perf['combine_times']) if perf['combine_times'] else 0
+        avg_verify = sum(perf['verify_times']) / len(perf['verify_times']) if perf['verify_times'] else 0
+        print(f"sQ = {sQ}:")
+        print(f"  Average Key Generation Time: {avg_keygen:.5f} s")
+        print(f"  Average Signing Time: {avg_sign:.5f} ms")
+        if perf['nonce_times']:
+            avg_nonce = sum(perf['nonce_times']) / len(perf['nonce_times'])
+            print(f"  Average Presignature Time: {avg_nonce:.5f} ms (dealer, not part of signing)")
+        if perf['parallel_sign_times']:
+            avg_parallel = sum(perf['parallel_sign_times']) / len(perf['parallel_sign_times'])
+            speedup = avg_sign / avg_parallel if avg_parallel else 0
+            print(f"  Average Parallel Signing Time: {avg_parallel:.5f} ms ({speedup:.2f}x)")
+        print(f"  Average Combining Time: {avg_combine:.5f} ms")
+        print(f"  Average Verification Time: {avg_verify:.5f} ms")
+        if perf['recovery_times']:
+            avg_recovery = sum(perf['recovery_times']) / len(perf['recovery_times'])
+            print(f"  Average Recovery Time: {avg_recovery:.5f} ms ({len(perf['recovery_times'])} runs fell back)")
+
+    if VERIFY_CACHE is not None:
+        metrics = VERIFY_CACHE.metrics()
+        print(f"\nVerification cache: signatures {metrics['signature_hit_rate']:.1%} hit rate "
+              f"({metrics['signature_hits']} hits), lookups {metrics['lookup_hit_rate']:.1%} hit rate "
+              f"({metrics['lookup_hits']} hits), {metrics['expired']} expired")
+
+    if instrumentation.enabled:
+        print("\nInstrumentation:")
+        print(instrumentation.report())
@@ -0,0 +1,148 @@
+import math
+
+import numpy as np
+
+# Regression gate between a baseline and a candidate result set. A (phase,
+# group) pair is a regression when the candidate median is more than
+# TOLERANCE slower and the difference is significant at ALPHA, a speedup for
+# the mirror case, and unchanged otherwise. With fewer than MIN_RUNS samples
+# on either side (the stored Go results have one per configuration), or so
+# few that even two samples with no overlap at all could not reach ALPHA, no
+# test is possible, so the pair is reported as insufficient data and never
+# fails the gate.
+TOLERANCE = 0.05
+ALPHA = 0.05
+MIN_RUNS = 4
+METHODS = ('mannwhitney', 'bootstrap')
+BOOTSTRAP_SAMPLES = 2000
+# Only these phases fail the gate; keygen is reported but too noisy to gate on
+GATED_PHASES = ['sign_times', 'combine_times', 'verify_times', 'encoding_time_ms', 'decoding_time_ms']
+# Phases that time the signing protocol itself. When the two sides were
+# signed under different protocols these are reported, not tested.
+PROTOCOL_PHASES = ['sign_times', 'nonce_times', 'parallel_sign_times', 'recovery_times']
+
+
+def _ranks(values):
+    # 1-based ranks, ties get the mean of the ranks they span
+    order = np.argsort(values, kind='stable')
+    ordered = values[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat((starts + ends + 1) / 2, ends - starts)
+    return ranks, ends - starts
+
+
+def mann_whitney(baseline, candidate):
+    # Two-sided p-value of the Mann-Whitney U test, normal approximation with
+    # tie and continuity correction
+    n1, n2 = len(baseline), len(candidate)
+    ranks, ties = _ranks(np.concatenate([baseline, candidate]))
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - (ties ** 3 - ties).sum() / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+def min_p_value(n1, n2):
+    # Smallest p mann_whitney can return for these sample sizes; 3 runs
+    # against 3 never get below 0.081
+    return mann_whitney(np.arange(n1), np.arange(n1, n1 + n2))
+
+
+def bootstrap_ci(baseline, candidate, alpha=ALPHA, samples=BOOTSTRAP_SAMPLES, rng=None):
+    # Percentile CI of the relative change in the median
+    rng = rng if rng is not None else np.random.default_rng(0)
+    before = np.median(rng.choice(baseline, (samples, len(baseline))), axis=1)
+    after = np.median(rng.choice(candidate, (samples, len(candidate))), axis=1)
+    changes = after / before - 1
+    return tuple(np.percentile(changes, [100 * alpha / 2, 100 * (1 - alpha / 2)]))
+
+
+def verdict(change, significant, tolerance=TOLERANCE):
+    if change is None or not significant:
+        return 'unchanged'
+    if change > tolerance:
+        return 'regression'
+    if change < -tolerance:
+        return 'speedup'
+    return 'unchanged'
+
+
+def compare_results(baseline, candidate, phases=None, tolerance=TOLERANCE, alpha=ALPHA, method='mannwhitney',
+                    seed=0):
+    # One row per (phase, group) recorded on both sides; medians in the
+    # recorded units (ms, seconds for keygen)
+    if method not in METHODS:
+        raise ValueError(f"unknown test {method!r}, expected one of {METHODS}")
+    if phases is None:
+        phases = [phase for phase in baseline.phases if phase in candidate.phases]
+    rng = np.random.default_rng(seed)
+    rows = []
+    for phase in phases:
+        if phase not in baseline.phases or phase not in candidate.phases:
+            continue
+        before = baseline.aggregate(phase)
+        after = candidate.aggregate(phase)
+        groups, before_index, after_index = np.intersect1d(before['groups'], after['groups'], return_indices=True)
+        for group, i, j in zip(groups, before_index, after_index):
+            base, cand = float(before['p50'][i]), float(after['p50'][j])
+            change = cand / base - 1 if base else None
+            row = {
+                'phase': phase,
+                'group': int(group),
+                'baseline': base,
+                'candidate': cand,
+                'change': change,
+                'baseline_runs': int(before['count'][i]),
+                'candidate_runs': int(after['count'][j]),
+                'p_value': None,
+                'ci': None,
+            }
+            if phase in PROTOCOL_PHASES and baseline.protocol != candidate.protocol:
+                row['verdict'] = 'protocol changed'
+                rows.append(row)
+                continue
+            runs = row['baseline_runs'], row['candidate_runs']
+            if min(runs) < MIN_RUNS or (method == 'mannwhitney' and min_p_value(*runs) >= alpha):
+                row['verdict'] = 'insufficient data'
+                rows.append(row)
+                continue
+            if method == 'mannwhitney':
+                row['p_value'] = mann_whitney(baseline.values(phase, group), candidate.values(phase, group))
+                significant = row['p_value'] < alpha
+            else:
+                row['ci'] = bootstrap_ci(baseline.values(phase, group), candidate.values(phase, group), alpha,
+                                         rng=rng)
+                significant = row['ci'][0] > 0 or row['ci'][1] < 0
+            row['verdict'] = verdict(change, significant, tolerance)
+            rows.append(row)
+    return rows
+
+
+def regressions(rows, gated_phases=GATED_PHASES):
+    return [row for row in rows if row['verdict'] == 'regression' and row['phase'] in gated_phases]
+
+
+def format_table(rows, group_name='sQ'):
+    width = max(6, len(group_name))
+    header = (f"{'phase':<20} {group_name:>{width}} {'baseline':>12} {'candidate':>12} {'change':>8} "
+              f"{'runs':>7} {'test':>17}  verdict")
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row['change'] is not None else 'n/a'
+        runs = f"{row['baseline_runs']}/{row['candidate_runs']}"
+        if row['p_value'] is not None:
+            test = f"p={row['p_value']:.3f}"
+        elif row['ci'] is not None:
+            test = f"[{row['ci'][0]:+.1%}, {row['ci'][1]:+.1%}]"
+        elif row['verdict'] == 'protocol changed':
+            test = 'not comparable'
+        else:
+            test = 'too few runs'
+        lines.append(f"{row['phase']:<20} {row['group']:>{width}} {row['baseline']:>12.4f} "
+                     f"{row['candidate']:>12.4f} {change:>8} {runs:>7} {test:>17}  {row['verdict']}")
+    return '\n'.join(lines)
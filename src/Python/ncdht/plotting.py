@@ -0,0 +1,72 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+# (phase, file name, axis label, color); records hold keygen in seconds and
+# the other phases in ms already
+PLOTS = [
+    ('keygen_times', 'keygen', 'Time (s)', '#800080'),
+    ('sign_times', 'sign', 'Time (ms)', '#FA4616'),
+    ('combine_times', 'combine', 'Time (ms)', '#00BFFF'),
+    ('verify_times', 'verify', 'Time (ms)', '#008000'),
+    ('parallel_sign_times', 'parallel_sign', 'Time (ms)', '#0000FF'),
+]
+STYLES = ('bar', 'box')
+
+
+# Bar plot of the means with std error bars, values on top, and dashed grid lines
+def save_bar_plot(results, phase, ylabel, color, filename):
+    summary = results.aggregate(phase)
+    data = summary['mean']
+    fig, ax = plt.subplots(figsize=(8, 6))
+    x = np.arange(len(data))
+    bars = ax.bar(x, data, 0.5, color=color, yerr=summary['std'], capsize=5, ecolor='black')
+
+    for bar in bars:
+        yval = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2, yval + 0.05 * max(data), f'{yval:.2f}',
+                ha='center', va='bottom', fontsize=10)
+
+    ax.set_xlabel('Number of Peers in Quorum (sQ)')
+    ax.set_ylabel(ylabel)
+    ax.set_xticks(x)
+    ax.set_xticklabels([str(sQ) for sQ in summary['groups']])
+    ax.grid(True, linestyle='--', alpha=0.5)
+
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+
+
+# Box plot of every recorded run per sQ
+def save_box_plot(results, phase, ylabel, color, filename):
+    groups = results.groups(phase)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.boxplot([results.values(phase, sQ) for sQ in groups], labels=[str(sQ) for sQ in groups],
+               patch_artist=True,
+               boxprops=dict(facecolor=color, color=color),
+               whiskerprops=dict(color=color),
+               capprops=dict(color=color),
+               medianprops=dict(color='black'))
+    ax.set_xlabel('Number of Peers in Quorum (sQ)')
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+
+
+def plot_results(results, style='bar', prefix='', output_dir='.'):
+    if style not in STYLES:
+        raise ValueError(f"unknown plot style {style!r}, expected one of {STYLES}")
+    save = save_bar_plot if style == 'bar' else save_box_plot
+    written = []
+    for phase, name, ylabel, color in PLOTS:
+        # Optional phases (parallel signing) only get a plot when they were recorded
+        if phase not in results.phases or not len(results.groups(phase)):
+            continue
+        filename = os.path.join(output_dir, f"{prefix}{name}_time_final.png")
+        save(results, phase, ylabel, color, filename)
+        written.append(filename)
+    return written
@@ -0,0 +1,172 @@
+import hashlib
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from keygen_cache import QuorumMaterial, generate_material
+from parallel_signing import SigningPool
+from results_stream import ResultWriter, collect, completed_runs, make_record, read_records
+from signing import SIGNING_PROTOCOL
+
+from .benchmark import (FRESH_KEYGEN, GENERATOR_TABLE_CACHE, NUM_RUNS, PEER_COUNTS, QUORUM_CACHE, RESULTS_STREAM,
+                        SIGN_WORKERS, prepare_backend, run_once)
+
+# Parameter sweep over (sQ, run) jobs. 'parallel' runs whole jobs on a pool
+# of worker processes pinned one per core; 'hybrid' only fans out keygen
+# and times sign/combine/verify serially in this process, so the sub-ms
+# phases never share the machine; 'serial' runs every job in this process.
+# Keygen is timed on run 0 of each sQ unless fresh_keygen times it on every
+# run; sign_workers adds the parallel signing phase (round 1 on a worker
+# pool) to every run, with one pool for the whole sweep. Parallel mode
+# already has a job on every core, so it takes no sign_workers. Quorum
+# sizes, runs and output default to those in ncdht.benchmark; these are
+# also the defaults of python -m ncdht sweep.
+SWEEP_MODE = 'hybrid'
+SWEEP_WORKERS = None
+SWEEP_SEED = 0
+MODES = ('parallel', 'hybrid', 'serial')
+
+
+def job_seed(base_seed, sQ, run):
+    # Independent of scheduling order and of PYTHONHASHSEED
+    digest = hashlib.sha256(f"{base_seed}:{sQ}:{run}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(cores, next_slot):
+    # Each worker claims the next core, so no two share one
+    with next_slot.get_lock():
+        slot = next_slot.value
+        next_slot.value += 1
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cores[slot % len(cores)]})
+    prepare_backend(GENERATOR_TABLE_CACHE)
+
+
+def _signing_pool(sign_workers):
+    return SigningPool(sign_workers, GENERATOR_TABLE_CACHE) if sign_workers else None
+
+
+def _run_job(sQ, run, seed, sign_workers=SIGN_WORKERS, fresh_keygen=FRESH_KEYGEN, signing_pool=None):
+    random.seed(seed)
+    timings = run_once(sQ, sign_workers=sign_workers, fresh_keygen=fresh_keygen or run == 0,
+                       signing_pool=signing_pool)
+    if timings is None:
+        return None
+    # Keygen belongs to run 0 only, however the jobs landed on workers
+    if run and not fresh_keygen:
+        timings.pop('keygen_times', None)
+    return make_record(sQ, run, timings, seed=seed, protocol=SIGNING_PROTOCOL)
+
+
+def _generate_job(sQ, seed):
+    random.seed(seed)
+    return generate_material(sQ, sQ // 3 + 1).to_json()
+
+
+def _pool(workers):
+    cores = available_cores()
+    workers = workers or len(cores)
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(cores, multiprocessing.Value('i', 0)))
+
+
+def run_serial(jobs, writer, sign_workers=SIGN_WORKERS, fresh_keygen=FRESH_KEYGEN):
+    signing_pool = _signing_pool(sign_workers)
+    try:
+        for sQ, run, seed in jobs:
+            record = _run_job(sQ, run, seed, sign_workers, fresh_keygen, signing_pool)
+            if record is not None:
+                writer.write(record)
+    finally:
+        if signing_pool is not None:
+            signing_pool.close()
+
+
+def run_parallel(jobs, writer, workers=None, fresh_keygen=FRESH_KEYGEN):
+    with _pool(workers) as executor:
+        futures = [executor.submit(_run_job, sQ, run, seed, 0, fresh_keygen) for sQ, run, seed in jobs]
+        for future in as_completed(futures):
+            record = future.result()
+            if record is not None:
+                writer.write(record)
+
+
+def run_hybrid(jobs, writer, workers=None, base_seed=SWEEP_SEED, sign_workers=SIGN_WORKERS,
+               fresh_keygen=FRESH_KEYGEN):
+    # Key material, the only seconds-scale phase, is generated in parallel
+    # and handed to the quorum cache; every timed phase then runs serially.
+    # With fresh_keygen every run generates and times its own keygen instead.
+    sizes = [] if fresh_keygen else sorted({sQ for sQ, _, _ in jobs})
+    keygen_times = {}
+    with _pool(workers) as executor:
+        futures = {executor.submit(_generate_job, sQ, job_seed(base_seed, sQ, 'keygen')): sQ for sQ in sizes}
+        for future in as_completed(futures):
+            sQ = futures[future]
+            material = QuorumMaterial.from_json(future.result())
+            QUORUM_CACHE.put(sQ, sQ // 3 + 1, 0, material)
+            keygen_times[sQ] = material.keygen_time
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    signing_pool = _signing_pool(sign_workers)
+    try:
+        for sQ, run, seed in jobs:
+            random.seed(seed)
+            timings = run_once(sQ, sign_workers=sign_workers, fresh_keygen=fresh_keygen, signing_pool=signing_pool)
+            if timings is None:
+                continue
+            if run == 0 and not fresh_keygen:
+                timings['keygen_times'] = keygen_times[sQ]
+            writer.write(make_record(sQ, run, timings, seed=seed, protocol=SIGNING_PROTOCOL))
+    finally:
+        if signing_pool is not None:
+            signing_pool.close()
+
+
+def merge(path):
+    # Rewrite the stream in (sQ, run) order so every mode yields the same dataset
+    records = sorted(read_records(path), key=lambda record: (record['sQ'], record['run']))
+    tmp_path = path + '.tmp'
+    with ResultWriter(tmp_path) as writer:
+        for record in records:
+            writer.write(record)
+    os.replace(tmp_path, path)
+
+
+def sweep(peer_counts=PEER_COUNTS, num_runs=NUM_RUNS, mode=SWEEP_MODE, workers=SWEEP_WORKERS,
+          base_seed=SWEEP_SEED, path=RESULTS_STREAM, resume=False, sign_workers=SIGN_WORKERS,
+          fresh_keygen=FRESH_KEYGEN):
+    if mode not in MODES:
+        raise ValueError(f"unknown sweep mode {mode!r}, expected one of {MODES}")
+    if mode == 'parallel' and sign_workers:
+        # A signing pool per job worker would oversubscribe the cores, and
+        # worker processes can't shut a nested pool down cleanly on exit
+        raise ValueError("parallel mode runs a job on every core; time parallel signing in serial or hybrid mode")
+    done = completed_runs(path) if resume else set()
+    jobs = [(sQ, run, job_seed(base_seed, sQ, run))
+            for sQ in peer_counts for run in range(num_runs) if (sQ, run) not in done]
+    with ResultWriter(path, resume=resume) as writer:
+        if mode == 'serial':
+            prepare_backend(GENERATOR_TABLE_CACHE)
+            run_serial(jobs, writer, sign_workers, fresh_keygen)
+        elif mode == 'parallel':
+            run_parallel(jobs, writer, workers, fresh_keygen)
+        else:
+            run_hybrid(jobs, writer, workers, base_seed, sign_workers, fresh_keygen)
+    merge(path)
+    return collect(path)
+
+
+def save_columnar(path):
+    # sweep.jsonl -> sweep.npz; NumPy is only loaded here
+    from columnar import ResultTable
+    columnar_path = os.path.splitext(path)[0] + '.npz'
+    ResultTable.from_records(read_records(path)).save(columnar_path)
+    return columnar_path
+
@@ -0,0 +1,269 @@
+import heapq
+import json
+import time
+import uuid
+
+import numpy as np
+
+from main import GENERATOR_TABLE_CACHE, QUORUM_CACHE, CompactQuorum, prepare_backend, verify_signature
+from chord_ring import ChordRing
+
+# Discrete-event simulation of multi-hop lookups. Each hop the initiator
+# sends the request to every peer of the quorum, each peer computes its share
+# and replies, and the first t+1 replies to arrive win; the initiator then
+# combines and verifies, and the proof travels on with the next request.
+# Every peer signs one share at a time, so under load requests queue behind
+# the ones the peer is already serving and the arrival rate shows up as
+# queueing delay.
+# Times are simulated seconds, built from link latency samples and compute
+# times calibrated from the real Quorum.respond / combine_shares / verify.
+NUM_QUORUMS = 10000
+QUORUM_SIZE = 10
+NUM_LOOKUPS = 100000
+# Mean lookup arrivals per simulated second (Poisson)
+ARRIVAL_RATE = 1000.0
+STRAGGLER_FRACTION = 0.1
+STRAGGLER_SLOWDOWN = 10.0
+OFFLINE_FRACTION = 0.05
+CALIBRATION_ROUNDS = 20
+# Random draws are made this many at a time; a NumPy call per hop and per
+# peer would dominate the run time
+SAMPLE_BLOCK = 1 << 16
+
+
+def constant_latency(ms):
+    return lambda rng, size: np.full(size, ms / 1e3)
+
+
+def uniform_latency(low_ms, high_ms):
+    return lambda rng, size: rng.uniform(low_ms / 1e3, high_ms / 1e3, size)
+
+
+def lognormal_latency(median_ms, sigma=0.5):
+    # Heavy right tail, as wide-area round trips tend to have
+    return lambda rng, size: rng.lognormal(np.log(median_ms / 1e3), sigma, size)
+
+
+class SampleBuffer:
+    def __init__(self, source, block=SAMPLE_BLOCK):
+        self.source = source
+        self.block = block
+        self.samples = np.empty(0)
+        self.pos = 0
+
+    def take(self, rng, size):
+        if self.pos + size > len(self.samples):
+            self.samples = self.source(rng, max(self.block, size))
+            self.pos = 0
+        self.pos += size
+        return self.samples[self.pos - size:self.pos]
+
+
+class ExecutedCompute:
+    # Runs the real quorum operations and reports their measured CPU time.
+    # Far too slow for large runs; calibrate() turns it into a CalibratedCompute.
+    # shares() returns the per-peer times plus the round's state, which the
+    # simulator hands back to initiator() once the shares are in.
+    def __init__(self, quorum):
+        self.quorum = quorum
+
+    def shares(self, rng, size):
+        message = f"REQUEST|{uuid.uuid4()}|{time.time()}"
+        signatures, _, signers, sign_time = self.quorum.respond(message, self.quorum.tQ + 1)
+        # Peers sign in parallel in a real network, each paying one share
+        return np.full(size, sign_time / len(signers)), (message, signatures, signers)
+
+    def combine(self, state):
+        message, signatures, signers = state
+        combined_signature, combine_time = self.quorum.combine_shares(signatures, signers, message)
+        return combine_time, (message, combined_signature)
+
+    def verify(self, state):
+        message, combined_signature = state
+        start = time.perf_counter()
+        verify_signature(self.quorum.public_key, message.encode(), combined_signature)
+        return time.perf_counter() - start
+
+    def initiator(self, rng, state):
+        combine_time, combined = self.combine(state)
+        return combine_time + self.verify(combined)
+
+
+class CalibratedCompute:
+    # Compute times resampled from measured phase timings
+    def __init__(self, sign_samples, combine_samples, verify_samples):
+        self.sign_samples = np.asarray(sign_samples)
+        self.combine_samples = np.asarray(combine_samples)
+        self.verify_samples = np.asarray(verify_samples)
+        self.sign = SampleBuffer(lambda rng, size: rng.choice(self.sign_samples, size))
+        self.initiator_times = SampleBuffer(lambda rng, size: rng.choice(self.combine_samples, size)
+                                            + rng.choice(self.verify_samples, size))
+
+    def shares(self, rng, size):
+        return self.sign.take(rng, size), None
+
+    def initiator(self, rng, state):
+        # Combine plus verify, back to back on the initiator
+        return float(self.initiator_times.take(rng, 1)[0])
+
+
+def calibrate(quorum, rounds=CALIBRATION_ROUNDS, seed=None):
+    executed = ExecutedCompute(quorum)
+    rng = np.random.default_rng(seed)
+    sign, combine, verify = [], [], []
+    for _ in range(rounds):
+        times, state = executed.shares(rng, 1)
+        combine_time, combined = executed.combine(state)
+        sign.append(times[0])
+        combine.append(combine_time)
+        verify.append(executed.verify(combined))
+    return CalibratedCompute(sign, combine, verify)
+
+
+class NetworkSimulator:
+    def __init__(self, ring, sQ, compute, latency=lognormal_latency(40), straggler_fraction=STRAGGLER_FRACTION,
+                 straggler_slowdown=STRAGGLER_SLOWDOWN, offline_fraction=OFFLINE_FRACTION, seed=None):
+        self.ring = ring
+        self.sQ = sQ
+        self.tQ = sQ // 3
+        self.compute = compute
+        self.latency = SampleBuffer(latency)
+        self.straggler_fraction = straggler_fraction
+        self.straggler_slowdown = straggler_slowdown
+        self.offline_fraction = offline_fraction
+        self.rng = np.random.default_rng(seed)
+        # Per-quorum compute multipliers: 1, the straggler slowdown, or inf
+        # for offline peers; drawn the first time a quorum is contacted
+        self.peer_speeds = {}
+        # Per-quorum times at which each peer finishes its queued shares
+        self.peer_busy = {}
+        self.events = []
+        self.sequence = 0
+        self.processed = 0
+
+    def speeds(self, index):
+        speeds = self.peer_speeds.get(index)
+        if speeds is None:
+            draw = self.rng.random(self.sQ)
+            speeds = np.where(draw < self.offline_fraction, np.inf,
+                              np.where(draw < self.offline_fraction + self.straggler_fraction,
+                                       self.straggler_slowdown, 1.0))
+            self.peer_speeds[index] = speeds
+        return speeds
+
+    def busy_until(self, index):
+        busy = self.peer_busy.get(index)
+        if busy is None:
+            busy = self.peer_busy[index] = np.zeros(self.sQ)
+        return busy
+
+    def schedule(self, at, kind, lookup):
+        heapq.heappush(self.events, (at, self.sequence, kind, lookup))
+        self.sequence += 1
+
+    def collect_time(self, now, index, lookup):
+        # Request out, share computed once the peer is free, reply back, for
+        # every peer at once; the (t+1)-th earliest arrival is when the
+        # initiator holds enough shares. Peers serve requests in the order
+        # they were sent rather than received, close enough with independent
+        # link samples.
+        round_trips = self.latency.take(self.rng, 2 * self.sQ)
+        compute, lookup['state'] = self.compute.shares(self.rng, self.sQ)
+        busy = self.busy_until(index)
+        received = now + round_trips[:self.sQ]
+        started = np.maximum(received, busy)
+        finished = started + compute * self.speeds(index)
+        online = np.isfinite(finished)
+        busy[online] = finished[online]
+        arrivals = finished + round_trips[self.sQ:]
+        winner = np.argpartition(arrivals, self.tQ)[self.tQ]
+        lookup['queued'] += float(started[winner] - received[winner])
+        return float(arrivals[winner])
+
+    def handle(self, now, kind, lookup):
+        if kind == 'hop':
+            index = lookup['path'][lookup['hop']]
+            collected = self.collect_time(now, index, lookup)
+            if collected == np.inf:
+                lookup['failed'] = True
+                lookup['finished'] = now
+                return
+            self.schedule(collected, 'collected', lookup)
+        elif kind == 'collected':
+            done = now + self.compute.initiator(self.rng, lookup['state'])
+            lookup['hop'] += 1
+            if lookup['hop'] < len(lookup['path']):
+                self.schedule(done, 'hop', lookup)
+            else:
+                lookup['finished'] = done
+
+    def run(self, num_lookups, arrival_rate=ARRIVAL_RATE):
+        gaps = self.rng.exponential(1 / arrival_rate, num_lookups)
+        starts = self.rng.integers(len(self.ring), size=num_lookups)
+        keys = self.rng.integers(self.ring.ring_size, size=num_lookups)
+        lookups = []
+        for arrival, start, key in zip(np.cumsum(gaps), starts, keys):
+            lookup = {'arrival': float(arrival), 'path': self.ring.lookup_path(int(start), int(key)),
+                      'hop': 0, 'state': None, 'queued': 0.0, 'failed': False, 'finished': None}
+            lookups.append(lookup)
+            self.schedule(lookup['arrival'], 'hop', lookup)
+        while self.events:
+            now, _, kind, lookup = heapq.heappop(self.events)
+            self.processed += 1
+            self.handle(now, kind, lookup)
+        return lookups
+
+
+def summarize(lookups):
+    completed = [lookup for lookup in lookups if not lookup['failed']]
+    latencies = np.array([lookup['finished'] - lookup['arrival'] for lookup in completed]) * 1e3
+    queued = np.array([lookup['queued'] for lookup in completed]) * 1e3
+    return {
+        'lookups': len(lookups),
+        'failed': len(lookups) - len(completed),
+        'mean_hops': float(np.mean([len(lookup['path']) - 1 for lookup in lookups])),
+        'mean_latency_ms': float(latencies.mean()) if len(latencies) else None,
+        'p50_latency_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+        'p95_latency_ms': float(np.percentile(latencies, 95)) if len(latencies) else None,
+        'p99_latency_ms': float(np.percentile(latencies, 99)) if len(latencies) else None,
+        # Time the deciding share spent waiting for a busy peer, summed over hops
+        'mean_queueing_ms': float(queued.mean()) if len(queued) else None,
+    }
+
+
+def simulate_network(num_quorums=NUM_QUORUMS, sQ=QUORUM_SIZE, num_lookups=NUM_LOOKUPS, latency=None,
+                     arrival_rate=ARRIVAL_RATE, seed=None):
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    quorum = CompactQuorum("0", sQ, sQ // 3, cache=QUORUM_CACHE)
+    compute = calibrate(quorum, seed=seed)
+    ring = ChordRing(num_quorums, seed=seed)
+    simulator = NetworkSimulator(ring, sQ, compute, latency or lognormal_latency(40), seed=seed)
+    start_time = time.perf_counter()
+    lookups = simulator.run(num_lookups, arrival_rate)
+    wall_time = time.perf_counter() - start_time
+    result = summarize(lookups)
+    result.update({
+        'num_quorums': num_quorums,
+        'sQ': sQ,
+        'arrival_rate': arrival_rate,
+        'events': simulator.processed,
+        'wall_time_s': wall_time,
+        'lookups_per_minute': num_lookups / wall_time * 60,
+        'calibrated_sign_ms': float(np.median(compute.sign_samples)) * 1e3,
+        'calibrated_verify_ms': float(np.median(compute.verify_samples)) * 1e3,
+    })
+    return result
+
+
+if __name__ == "__main__":
+    result = simulate_network()
+    with open('netsim_results.json', 'w') as f:
+        json.dump(result, f, indent=4)
+    print(f"\nSimulated {result['lookups']} lookups over {result['num_quorums']} quorums (sQ = {result['sQ']}, "
+          f"{result['arrival_rate']:.0f} lookups/s):")
+    print(f"  Mean hops: {result['mean_hops']:.2f}, failed: {result['failed']}")
+    print(f"  Latency: mean {result['mean_latency_ms']:.1f} ms, p50 {result['p50_latency_ms']:.1f}, "
+          f"p95 {result['p95_latency_ms']:.1f}, p99 {result['p99_latency_ms']:.1f}, "
+          f"queueing {result['mean_queueing_ms']:.1f}")
+    print(f"  {result['events']} events in {result['wall_time_s']:.1f} s "
+          f"({result['lookups_per_minute']:.0f} lookups per minute)")
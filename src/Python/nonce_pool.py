@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import deque
+
+from instrumentation import count, span
+
+
+class NoncePool:
+    # Precomputed presignatures (signing.deal_presignature), made by
+    # generate(). Dealing does not depend on the message, so it happens ahead
+    # of time and the lookup only pops one. A background thread tops the
+    # pool up once it drops below the low-water mark. Every presignature is
+    # handed out exactly once.
+    def __init__(self, generate, size=16, low_water=None):
+        self.generate = generate
+        self.size = size
+        self.low_water = size // 2 if low_water is None else low_water
+        self.nonces = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.hits = 0
+        self.misses = 0
+        # Fill up front so the first lookups never race the refill thread
+        for _ in range(size):
+            self.nonces.append(self._generate())
+        self.thread = threading.Thread(target=self._refill, daemon=True)
+        self.thread.start()
+
+    def _generate(self):
+        start = time.perf_counter()
+        nonce = self.generate()
+        return nonce, time.perf_counter() - start
+
+    def _refill(self):
+        while True:
+            with self.condition:
+                while not self.closed and len(self.nonces) >= self.low_water:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                missing = self.size - len(self.nonces)
+            for _ in range(missing):
+                entry = self._generate()
+                with self.condition:
+                    if self.closed:
+                        return
+                    self.nonces.append(entry)
+
+    def take(self):
+        # Returns (nonce, offline_time); offline_time is None when the pool ran
+        # dry and the nonce had to be made on the caller's (online) path.
+        with self.condition:
+            if self.nonces:
+                nonce, offline_time = self.nonces.popleft()
+                self.hits += 1
+                count('nonce_pool.hit')
+                if len(self.nonces) < self.low_water:
+                    self.condition.notify()
+                return nonce, offline_time
+            self.misses += 1
+        count('nonce_pool.miss')
+        with span('nonce'):
+            return self.generate(), None
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
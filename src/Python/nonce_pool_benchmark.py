@@ -0,0 +1,63 @@
+import json
+import statistics
+
+from main import GENERATOR_TABLE_CACHE, NONCE_POOL_SIZE, QUORUM_CACHE, Initiator, Quorum, prepare_backend
+
+# Lookup latency as the initiator sees it, with every signing round dealing
+# its presignature online (counted in the latency) versus popping one from a
+# precomputed pool. The dealer's cost per presignature is reported alongside.
+QUORUM_SIZES = [10, 50, 100, 150]
+NUM_LOOKUPS = 20
+
+
+def online_latencies(sQ, nonce_pool_size, num_lookups):
+    tQ = sQ // 3
+    # Enough nonces that the refill thread never runs while a lookup is timed
+    if nonce_pool_size:
+        nonce_pool_size = max(nonce_pool_size, 2 * num_lookups)
+    quorum = Quorum("0", sQ, tQ, cache=QUORUM_CACHE, nonce_pool_size=nonce_pool_size)
+    try:
+        latencies, sign_times, nonce_times = [], [], []
+        for _ in range(num_lookups):
+            initiator = Initiator(quorum, sQ, tQ)
+            if not initiator.lookup():
+                continue
+            perf = initiator.performance
+            online = perf['sign_times'] + perf['combine_times'] + perf['verify_times']
+            if not quorum.nonce_offline:
+                online += perf['nonce_times']
+            latencies.append(sum(online) * 1e3)
+            sign_times.append(perf['sign_times'][0] * 1e3)
+            nonce_times.extend(t * 1e3 for t in perf['nonce_times'])
+    finally:
+        quorum.close()
+    return latencies, sign_times, nonce_times
+
+
+def benchmark_nonce_pool(quorum_sizes=QUORUM_SIZES, num_lookups=NUM_LOOKUPS, pool_size=NONCE_POOL_SIZE or 16):
+    results = []
+    for sQ in quorum_sizes:
+        cold_latency, cold_sign, _ = online_latencies(sQ, 0, num_lookups)
+        pool_latency, pool_sign, offline = online_latencies(sQ, pool_size, num_lookups)
+        results.append({
+            'sQ': sQ,
+            'online_median_ms': statistics.median(cold_latency),
+            'pooled_median_ms': statistics.median(pool_latency),
+            'online_sign_median_ms': statistics.median(cold_sign),
+            'pooled_sign_median_ms': statistics.median(pool_sign),
+            'offline_nonce_median_ms': statistics.median(offline) if offline else None,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    results = benchmark_nonce_pool()
+    with open('nonce_pool_performance.json', 'w') as f:
+        json.dump(results, f, indent=4)
+    print("\nMedian lookup latency (in milliseconds), presignature dealt online vs precomputed:")
+    for row in results:
+        speedup = row['online_median_ms'] / row['pooled_median_ms'] if row['pooled_median_ms'] else 0
+        print(f"sQ = {row['sQ']}: online {row['online_median_ms']:.3f}, pooled {row['pooled_median_ms']:.3f} "
+              f"({speedup:.2f}x); signing {row['online_sign_median_ms']:.3f} -> {row['pooled_sign_median_ms']:.3f}, "
+              f"dealer {row['offline_nonce_median_ms']:.3f}")
@@ -0,0 +1,47 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ec_backend import multiply_g, prepare_backend
+
+# Worker processes for signing round 1, the per-signer nonce commitments
+# R_i = k_i*G, which is where the EC work of signing is. The pool
+# initializer builds each worker's generator table once, so requests only
+# carry the signers' nonce shares; round 2 is scalar arithmetic and stays in
+# the caller's process.
+
+
+def _ready(_):
+    return os.getpid()
+
+
+def _commit_batch(nonce_shares):
+    return [multiply_g(k) for k in nonce_shares]
+
+
+class SigningPool:
+    def __init__(self, workers=None, table_cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            initializer=prepare_backend,
+                                            initargs=(table_cache,))
+        # Start every worker up front so process startup and the generator
+        # table build never land inside a timed signing call.
+        list(self.executor.map(_ready, range(self.workers)))
+
+    def commit(self, presignature_shares):
+        # Contiguous chunks, one per worker, keep the results in signer order.
+        nonce_shares = [share[0] for share in presignature_shares]
+        size, extra = divmod(len(nonce_shares), self.workers)
+        chunks, start = [], 0
+        for w in range(self.workers):
+            end = start + size + (1 if w < extra else 0)
+            if end > start:
+                chunks.append(nonce_shares[start:end])
+            start = end
+        commitments = []
+        for batch in self.executor.map(_commit_batch, chunks):
+            commitments.extend(batch)
+        return commitments
+
+    def close(self):
+        self.executor.shutdown()
@@ -0,0 +1,43 @@
+import json
+import statistics
+
+from main import GENERATOR_TABLE_CACHE, PEER_COUNTS, Quorum, QuorumMaterialCache, generate_material, prepare_backend
+
+# Cost of a membership change handled by resharing versus a fresh keygen
+# for the new member set, across the PEER_COUNTS sizes.
+NUM_RUNS = 3
+RESULTS_FILE = 'reshare_performance.json'
+
+
+def benchmark_reshare(peer_counts=PEER_COUNTS, num_runs=NUM_RUNS):
+    results = []
+    for sQ in peer_counts:
+        tQ = sQ // 3
+        keygen, leave_join, threshold_change = [], [], []
+        for _ in range(num_runs):
+            keygen.append(generate_material(sQ, tQ + 1).keygen_time)
+            # A private cache so every run starts from its own sharing
+            quorum = Quorum("0", sQ, tQ, cache=QuorumMaterialCache(maxsize=1))
+            # One peer leaves and one joins: same size and threshold
+            leave_join.append(quorum.reshare(leaving=[0], joining=1))
+            # Grow the threshold by one, as a quorum would after growing
+            threshold_change.append(quorum.reshare(joining=3, tQ=tQ + 1))
+        results.append({
+            'sQ': sQ,
+            'keygen_s': statistics.median(keygen),
+            'reshare_leave_join_s': statistics.median(leave_join),
+            'reshare_threshold_s': statistics.median(threshold_change),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    results = benchmark_reshare()
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(results, f, indent=4)
+    print("\nMembership change cost (in seconds): fresh keygen vs resharing")
+    for row in results:
+        speedup = row['keygen_s'] / row['reshare_leave_join_s'] if row['reshare_leave_join_s'] else 0
+        print(f"sQ = {row['sQ']}: keygen {row['keygen_s']:.4f}, reshare (leave+join) "
+              f"{row['reshare_leave_join_s']:.4f} ({speedup:.1f}x), reshare (t+1) {row['reshare_threshold_s']:.4f}")
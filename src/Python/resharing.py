@@ -0,0 +1,34 @@
+from ec_point_operation import curve
+from ec_backend import multi_multiply, multiply_g
+from keygen_cache import QuorumMaterial
+from lagrange import lagrange_coefficients_at_zero
+from signing import deal_shares
+from instrumentation import span
+
+# Share redistribution (Desmedt-Jajodia style): t+1 current shareholders
+# each deal their own share d_i with a fresh degree-t' polynomial g_i, and
+# new member j ends up with d'_j = sum_i lambda_i * g_i(j). The secret, and so
+# the quorum public key, stays the same; only the sharing changes.
+
+
+def reshare_material(shares, public_key, dealers, new_size, new_threshold, modulus=curve.n):
+    # shares[i] belongs to x-coordinate i + 1; dealers are indices into it and
+    # need to number at least the old threshold. new_threshold counts shares
+    # needed to sign, like the threshold passed to generate_material.
+    with span('reshare') as timer:
+        with span('reshare.deal'):
+            dealt = [deal_shares(shares[i], new_size, new_threshold - 1, modulus) for i in dealers]
+        lambdas = lagrange_coefficients_at_zero([i + 1 for i in dealers], modulus)
+        with span('reshare.combine'):
+            new_shares = [sum(l * column[j] for l, column in zip(lambdas, dealt)) % modulus
+                          for j in range(new_size)]
+        with span('reshare.public_shares'):
+            public_key_shares = [multiply_g(s) for s in new_shares]
+        # Any new_threshold of the new public key shares must interpolate to
+        # the unchanged public key, or the dealers did not hold a valid sharing
+        xs = list(range(1, new_threshold + 1))
+        with span('reshare.check'):
+            combined = multi_multiply(lagrange_coefficients_at_zero(xs, modulus), public_key_shares[:new_threshold])
+        if combined != tuple(public_key):
+            raise ValueError("resharing does not preserve the quorum public key")
+    return QuorumMaterial(public_key, new_shares, public_key_shares, timer.elapsed)
@@ -0,0 +1,101 @@
+import json
+import os
+
+# Phase fields of a run record, in the units of the legacy *_performance.json
+# files: keygen in seconds, everything else in milliseconds.
+PHASES = ['keygen_times', 'sign_times', 'nonce_times', 'combine_times', 'verify_times', 'recovery_times',
+          'parallel_sign_times']
+# Only exported when some run actually recorded them
+OPTIONAL_PHASES = ['nonce_times', 'recovery_times', 'parallel_sign_times']
+LEGACY_FILES = {
+    'keygen_times': 'keygen_performance.json',
+    'sign_times': 'sign_performance.json',
+    'nonce_times': 'nonce_performance.json',
+    'combine_times': 'combine_performance.json',
+    'verify_times': 'verify_performance.json',
+    'recovery_times': 'recovery_performance.json',
+    'parallel_sign_times': 'parallel_sign_performance.json',
+}
+# Signing protocol of records without a protocol field, including the
+# legacy JSON: one nonce shared by all signers
+LEGACY_PROTOCOL = 'shared-nonce'
+
+
+def _drop_partial_record(path):
+    # A crash mid-write leaves an unterminated last line; cut it off so
+    # appended records start on a fresh line.
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+class ResultWriter:
+    def __init__(self, path, resume=False):
+        self.path = path
+        if resume and os.path.exists(path):
+            _drop_partial_record(path)
+        self.f = open(path, 'a' if resume else 'w')
+
+    def write(self, record):
+        self.f.write(json.dumps(record) + '\n')
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_record(sQ, run, timings, **extra):
+    record = {'sQ': sQ, 'run': run, **extra}
+    for phase, value in timings.items():
+        # Keygen stays in seconds, the other phases are stored in ms
+        record[phase] = value if phase == 'keygen_times' else value * 1e3
+    return record
+
+
+def read_records(path):
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def record_protocol(records):
+    # 'mixed' for a stream resumed across a protocol change
+    protocols = {record.get('protocol', LEGACY_PROTOCOL) for record in records}
+    if len(protocols) > 1:
+        return 'mixed'
+    return protocols.pop() if protocols else None
+
+
+def completed_runs(path):
+    return {(record['sQ'], record['run']) for record in read_records(path)}
+
+
+def collect(path):
+    data = {}
+    for record in read_records(path):
+        phases = data.setdefault(record['sQ'], {phase: [] for phase in PHASES})
+        for phase in PHASES:
+            if phase in record:
+                phases[phase].append(record[phase])
+    return data
+
+
+def export_legacy_json(data, directory='.'):
+    for phase, filename in LEGACY_FILES.items():
+        if phase in OPTIONAL_PHASES and not any(v[phase] for v in data.values()):
+            continue
+        with open(os.path.join(directory, filename), 'w') as f:
+            json.dump({str(sQ): {phase: v[phase]} for sQ, v in sorted(data.items())}, f, indent=4)
@@ -0,0 +1,178 @@
+import random
+import time
+import uuid
+
+import numpy as np
+
+from main import CompactQuorum, Quorum, QUORUM_CACHE, VERIFY_CACHE, prepare_backend, verify_signature, GENERATOR_TABLE_CACHE, span
+from chord_ring import ChordRing
+from rs_codec import EncodedRoutingTable, decode_routing_table, encode_routing_table
+
+# Ring sizes (number of quorums) for the end-to-end lookup sweep
+RING_SIZES = [10000, 25000, 50000, 100000]
+NUM_LOOKUPS = 20
+QUORUM_SIZE = 10
+# Distinct key materials shared round-robin by the quorums on the ring
+KEY_POOL = 8
+# Packed key material and on-demand peer views; set False for plain Peer objects
+COMPACT_QUORUMS = True
+# Each quorum's routing table is held as Reed-Solomon shards; the requester
+# reconstructs it at every hop with ROUTING_MISSING_SHARDS of them lost
+ROUTING_DATA_SHARDS = 8
+ROUTING_PARITY_SHARDS = 4
+ROUTING_MISSING_SHARDS = 2
+
+
+class RingLookupSimulator:
+    def __init__(self, ring, sQ=QUORUM_SIZE, key_pool=KEY_POOL, cache=QUORUM_CACHE, verify_cache=VERIFY_CACHE,
+                 compact=COMPACT_QUORUMS):
+        self.ring = ring
+        self.sQ = sQ
+        self.tQ = sQ // 3
+        self.key_pool = key_pool
+        self.cache = cache
+        self.verify_cache = verify_cache
+        self.quorum_class = CompactQuorum if compact else Quorum
+        self.quorums = {}
+        self.routing_tables = {}
+
+    def load_key_material(self):
+        # Generate the shared key pool up front so keygen never lands in a lookup
+        for seed in range(self.key_pool):
+            self.cache.get(self.sQ, self.tQ + 1, seed)
+
+    def quorum(self, index):
+        quorum_id = int(self.ring.ids[index])
+        if quorum_id not in self.quorums:
+            self.quorums[quorum_id] = self.quorum_class(str(quorum_id), self.sQ, self.tQ, cache=self.cache,
+                                                        seed=quorum_id % self.key_pool)
+        return self.quorums[quorum_id]
+
+    def encode_routing_table(self, index):
+        quorum_id = int(self.ring.ids[index])
+        self.routing_tables[quorum_id] = encode_routing_table(self.ring.routing_table(index),
+                                                              ROUTING_DATA_SHARDS, ROUTING_PARITY_SHARDS)
+        return self.routing_tables[quorum_id]
+
+    def encode_all_routing_tables(self):
+        for index in range(len(self.ring)):
+            self.encode_routing_table(index)
+
+    def reencode(self, changed):
+        # Only the routing tables whose fingers moved
+        for index in changed:
+            self.encode_routing_table(index)
+
+    def forget(self, quorum_id):
+        self.routing_tables.pop(quorum_id, None)
+        self.quorums.pop(quorum_id, None)
+
+    def join(self, quorum_id):
+        changed = self.ring.join(quorum_id)
+        self.reencode(changed)
+        return changed
+
+    def leave(self, quorum_id):
+        self.forget(quorum_id)
+        changed = self.ring.leave(quorum_id)
+        self.reencode(changed)
+        return changed
+
+    def routing_shards(self, index):
+        # Encoded once per quorum, outside the timed path; returns the shards
+        # as received, with a random subset missing
+        quorum_id = int(self.ring.ids[index])
+        encoded = self.routing_tables.get(quorum_id) or self.encode_routing_table(index)
+        received = list(encoded.shards)
+        for i in random.sample(range(len(received)), ROUTING_MISSING_SHARDS):
+            received[i] = None
+        return EncodedRoutingTable(encoded.metadata, received)
+
+    def lookup(self, start_index, key):
+        # Each quorum on the path signs its routing answer with t+1 shares;
+        # the requester verifies that proof before following the next hop.
+        lookup_id = uuid.uuid4()
+        stats = {'hops': 0, 'route_time': 0.0, 'sign_time': 0.0, 'combine_time': 0.0, 'verify_time': 0.0,
+                 'recovery_time': 0.0, 'decode_time': 0.0}
+        with span('route') as timer:
+            path = self.ring.lookup_path(start_index, key)
+        stats['route_time'] = timer.elapsed
+        stats['hops'] = len(path) - 1
+        # Building the simulated quorums and dropping shards stands in for
+        # state the peers already hold, so it stays outside the timed window
+        hops = [(self.quorum(index), self.routing_shards(index)) for index in path]
+        start_time = time.perf_counter()
+        for position, (quorum, received) in enumerate(hops):
+            with span('routing_table.decode') as timer:
+                decode_routing_table(received)
+            stats['decode_time'] += timer.elapsed
+            next_id = int(self.ring.ids[path[position + 1]]) if position + 1 < len(path) else quorum.id
+            message = f"ROUTE|{lookup_id}|{quorum.id}|{next_id}|{key}|{time.time()}"
+            signatures, valid, signers, sign_time = quorum.respond(message, num_signers=self.tQ + 1)
+            stats['sign_time'] += sign_time
+            if not valid:
+                return False, stats
+            combined_signature, combine_time = quorum.combine_shares(signatures, signers, message)
+            stats['combine_time'] += combine_time
+            with span('verify') as timer:
+                if self.verify_cache is not None:
+                    verified = self.verify_cache.verify(quorum.public_key, message, combined_signature)
+                else:
+                    verified = verify_signature(quorum.public_key, message.encode(), combined_signature)
+            stats['verify_time'] += timer.elapsed
+            if not verified:
+                # A bad share made the combined signature fail; without a
+                # valid proof for this hop the lookup cannot go on
+                with span('recover') as timer:
+                    combined_signature, _ = quorum.recover(message, signatures, signers)
+                stats['recovery_time'] += timer.elapsed
+                if combined_signature is None:
+                    stats['total_time'] = stats['route_time'] + time.perf_counter() - start_time
+                    return False, stats
+        stats['total_time'] = stats['route_time'] + time.perf_counter() - start_time
+        return True, stats
+
+
+def benchmark_ring(ring_sizes=RING_SIZES, num_lookups=NUM_LOOKUPS, sQ=QUORUM_SIZE):
+    prepare_backend(GENERATOR_TABLE_CACHE)
+    results = []
+    for num_quorums in ring_sizes:
+        start_time = time.perf_counter()
+        ring = ChordRing(num_quorums)
+        build_time = time.perf_counter() - start_time
+        simulator = RingLookupSimulator(ring, sQ)
+        simulator.load_key_material()
+        runs = []
+        for _ in range(num_lookups):
+            success, stats = simulator.lookup(random.randrange(num_quorums), random.randrange(ring.ring_size))
+            if success:
+                runs.append(stats)
+        results.append({
+            'num_quorums': num_quorums,
+            'm': ring.m,
+            'build_time_ms': build_time * 1e3,
+            'mean_hops': float(np.mean([r['hops'] for r in runs])),
+            'route_time_ms': float(np.mean([r['route_time'] for r in runs])) * 1e3,
+            'sign_time_ms': float(np.mean([r['sign_time'] for r in runs])) * 1e3,
+            'combine_time_ms': float(np.mean([r['combine_time'] for r in runs])) * 1e3,
+            'verify_time_ms': float(np.mean([r['verify_time'] for r in runs])) * 1e3,
+            'recovery_time_ms': float(np.mean([r['recovery_time'] for r in runs])) * 1e3,
+            'decode_time_ms': float(np.mean([r['decode_time'] for r in runs])) * 1e3,
+            'lookup_time_ms': float(np.mean([r['total_time'] for r in runs])) * 1e3,
+            'failed_lookups': num_lookups - len(runs),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print(f"\nEnd-to-end lookup cost (sQ = {QUORUM_SIZE}, {NUM_LOOKUPS} lookups per ring):")
+    for row in benchmark_ring():
+        print(f"{row['num_quorums']} quorums (m = {row['m']}):")
+        print(f"  Finger table build: {row['build_time_ms']:.2f} ms")
+        print(f"  Mean hops: {row['mean_hops']:.2f}")
+        print(f"  Average Lookup Time: {row['lookup_time_ms']:.3f} ms "
+              f"(route {row['route_time_ms']:.3f}, sign {row['sign_time_ms']:.3f}, "
+              f"combine {row['combine_time_ms']:.3f}, verify {row['verify_time_ms']:.3f}, "
+              f"routing table {row['decode_time_ms']:.3f})")
+        if row['failed_lookups']:
+            print(f"  Failed lookups: {row['failed_lookups']}")
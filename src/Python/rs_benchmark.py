@@ -0,0 +1,148 @@
+import json
+import random
+import statistics
+import time
+
+from chord_ring import ChordRing
+from rs_codec import DecodeMatrixCache, EncodedRoutingTable, ReedSolomon, decode_routing_table, encode_routing_table
+
+# Python counterpart of the src/Go/main.go routing-table benchmark: same
+# configurations, the same workload (one padded finger entry per data shard,
+# no JSON) and the same benchmark_results.json schema, so src/Go/plot.py can
+# draw both implementations on one chart.
+# (m, num_quorums, data_shards, parity_shards, num_missing_shards)
+CONFIGS = [
+    (4, 10, 5, 3, 1),
+    (5, 30, 10, 5, 3),
+    (9, 50, 16, 8, 5),
+    (10, 100, 20, 10, 5),
+    (12, 500, 48, 16, 8),
+    (13, 1000, 64, 24, 10),
+    (15, 5000, 96, 32, 12),
+    (17, 10000, 128, 32, 16),
+    (18, 15000, 128, 32, 16),
+    (19, 25000, 128, 32, 16),
+]
+NUM_RUNS = 5
+RESULTS_FILE = 'python_benchmark_results.json'
+# Distinct loss patterns cycled through by the decode cache benchmark
+NUM_PATTERNS = 4
+CACHE_RESULTS_FILE = 'decode_cache_results.json'
+
+
+def encode_entries(entries, data_shards, parity_shards):
+    # encodeRoutingTable in main.go: every entry zero padded to the longest
+    # one plus 10 bytes and used as one data shard
+    shard_size = max(len(entry) for entry in entries) + 10
+    shards = [entry.encode().ljust(shard_size, b'\0') for entry in entries]
+    shards += [bytes(shard_size)] * parity_shards
+    ReedSolomon(data_shards, parity_shards).encode(shards)
+    return shards
+
+
+def reconstruct_entries(shards, data_shards, parity_shards):
+    # reconstructShards in main.go: a fresh encoder, Reconstruct, then Verify
+    codec = ReedSolomon(data_shards, parity_shards)
+    codec.reconstruct(shards)
+    return codec.verify(shards)
+
+
+def benchmark_config(m, num_quorums, data_shards, parity_shards, num_missing, num_runs=NUM_RUNS):
+    ring = ChordRing(num_quorums, m=m)
+    entries = list(ring.routing_table(0).values())
+    # Like the Go benchmark, never ask for more data shards than routing
+    # entries, and encode only the first data_shards of them
+    data_shards = min(data_shards, len(entries))
+    entries = entries[:data_shards]
+    encode_times, decode_times = [], []
+    for _ in range(num_runs):
+        start = time.perf_counter()
+        shards = encode_entries(entries, data_shards, parity_shards)
+        encode_times.append((time.perf_counter() - start) * 1e3)
+        expected = list(shards)
+        for i in random.sample(range(data_shards + parity_shards), num_missing):
+            shards[i] = None
+        start = time.perf_counter()
+        verified = reconstruct_entries(shards, data_shards, parity_shards)
+        decode_times.append((time.perf_counter() - start) * 1e3)
+        if not verified or shards != expected:
+            raise RuntimeError(f"routing table for {num_quorums} quorums did not round-trip")
+    return {
+        'num_quorums': num_quorums,
+        'parity_shards': parity_shards,
+        'data_shards': data_shards,
+        'num_missing_shards': num_missing,
+        'encoding_time_ms': statistics.median(encode_times),
+        'decoding_time_ms': statistics.median(decode_times),
+    }
+
+
+def run_benchmark(configs=CONFIGS, num_runs=NUM_RUNS):
+    results = []
+    for m, num_quorums, data_shards, parity_shards, num_missing in configs:
+        if num_missing > parity_shards:
+            print("Skipping: can't recover that many data shard losses")
+            continue
+        results.append(benchmark_config(m, num_quorums, data_shards, parity_shards, num_missing, num_runs))
+    return results
+
+
+def benchmark_decode_cache(configs=CONFIGS, num_runs=NUM_RUNS, num_patterns=NUM_PATTERNS):
+    # Decode time with every matrix inverted from scratch versus served from a
+    # cache already holding the loss patterns, as recurring churn would leave it
+    results = []
+    for m, num_quorums, data_shards, parity_shards, num_missing in configs:
+        if num_missing > parity_shards:
+            continue
+        ring = ChordRing(num_quorums, m=m)
+        # The marshalled table is split byte-wise, so the full configured shard
+        # counts (up to 128+32) are used here rather than one entry per shard
+        encoded = encode_routing_table(ring.routing_table(0), data_shards, parity_shards)
+        patterns = [random.sample(range(data_shards + parity_shards), num_missing) for _ in range(num_patterns)]
+        received = []
+        for lost in patterns:
+            shards = list(encoded.shards)
+            for i in lost:
+                shards[i] = None
+            received.append(EncodedRoutingTable(encoded.metadata, shards))
+        cache = DecodeMatrixCache()
+        cold, warm = [], []
+        for _ in range(num_runs):
+            for shards in received:
+                cache.clear()
+                start = time.perf_counter()
+                decode_routing_table(shards, cache)
+                cold.append((time.perf_counter() - start) * 1e3)
+                start = time.perf_counter()
+                decode_routing_table(shards, cache)
+                warm.append((time.perf_counter() - start) * 1e3)
+        results.append({
+            'num_quorums': num_quorums,
+            'parity_shards': parity_shards,
+            'data_shards': data_shards,
+            'num_missing_shards': num_missing,
+            'cold_decoding_time_ms': statistics.median(cold),
+            'warm_decoding_time_ms': statistics.median(warm),
+            'hits': cache.hits,
+            'misses': cache.misses,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f"Benchmarking complete. Results saved to {RESULTS_FILE}")
+
+    cache_results = benchmark_decode_cache()
+    with open(CACHE_RESULTS_FILE, 'w') as f:
+        json.dump(cache_results, f, indent=2)
+        f.write('\n')
+    print("\nDecode time (in milliseconds) with a cold vs warm decode matrix cache:")
+    for row in cache_results:
+        speedup = row['cold_decoding_time_ms'] / row['warm_decoding_time_ms']
+        print(f"{row['num_quorums']} quorums ({row['data_shards']}+{row['parity_shards']}, "
+              f"{row['num_missing_shards']} missing): cold {row['cold_decoding_time_ms']:.3f}, "
+              f"warm {row['warm_decoding_time_ms']:.3f} ({speedup:.2f}x)")
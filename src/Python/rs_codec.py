@@ -0,0 +1,298 @@
+import base64
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from instrumentation import count, span
+
+# Reed-Solomon erasure coding of routing tables, shard-for-shard compatible
+# with github.com/klauspost/reedsolomon as used by coding/rs.go: GF(2^8)
+# with the reducing polynomial 0x11d and generator 2, and a systematic
+# encoding matrix derived from a Vandermonde matrix.
+GF_POLYNOMIAL = 0x11d
+MAX_SHARDS = 256
+# encoding/json escapes these even inside strings (SetEscapeHTML defaults on)
+GO_JSON_ESCAPES = [('<', '\\u003c'), ('>', '\\u003e'), ('&', '\\u0026'),
+                   ('\u2028', '\\u2028'), ('\u2029', '\\u2029')]
+
+
+def _build_tables():
+    exp = np.zeros(510, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int64)
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= GF_POLYNOMIAL
+    # Doubled so log[a] + log[b] never needs a modulo
+    exp[255:] = exp[:255]
+    return exp, log
+
+
+EXP_TABLE, LOG_TABLE = _build_tables()
+# MUL_TABLE[a, b] = a * b in GF(2^8). Multiplying a whole shard by a
+# constant c is then the single gather MUL_TABLE[c][shard].
+MUL_TABLE = EXP_TABLE[LOG_TABLE[:, None] + LOG_TABLE[None, :]]
+MUL_TABLE[0, :] = 0
+MUL_TABLE[:, 0] = 0
+
+
+def gal_inverse(a):
+    if not a:
+        raise ZeroDivisionError("0 has no inverse in GF(2^8)")
+    return int(EXP_TABLE[255 - LOG_TABLE[a]])
+
+
+def gal_exp(a, n):
+    if n == 0:
+        return 1
+    if a == 0:
+        return 0
+    return int(EXP_TABLE[LOG_TABLE[a] * n % 255])
+
+
+def gf_matmul(a, b):
+    # (r x k) . (k x c) over GF(2^8); only used on coefficient matrices
+    return np.bitwise_xor.reduce(MUL_TABLE[a[:, :, None], b[None, :, :]], axis=1)
+
+
+def gf_invert(matrix):
+    # Gauss-Jordan elimination on [matrix | I], one row operation per pivot
+    n = len(matrix)
+    work = np.concatenate([matrix, np.eye(n, dtype=np.uint8)], axis=1)
+    for col in range(n):
+        rows = np.nonzero(work[col:, col])[0]
+        if not len(rows):
+            raise ValueError("matrix is singular")
+        pivot = col + int(rows[0])
+        if pivot != col:
+            work[[col, pivot]] = work[[pivot, col]]
+        work[col] = MUL_TABLE[gal_inverse(int(work[col, col]))][work[col]]
+        factors = work[:, col].copy()
+        factors[col] = 0
+        work ^= MUL_TABLE[factors[:, None], work[col][None, :]]
+    return work[:, n:]
+
+
+def build_matrix(data_shards, total_shards):
+    # Vandermonde rows r^c, multiplied by the inverse of the top square so
+    # the data shards are passed through unchanged (buildMatrix in Go).
+    vandermonde = np.array([[gal_exp(r, c) for c in range(data_shards)] for r in range(total_shards)],
+                           dtype=np.uint8)
+    return gf_matmul(vandermonde, gf_invert(vandermonde[:data_shards]))
+
+
+# Encoding matrices depend only on the shard counts; built once and shared
+_encoding_matrices = {}
+
+
+def encoding_matrix(data_shards, total_shards):
+    key = (data_shards, total_shards)
+    if key not in _encoding_matrices:
+        matrix = build_matrix(data_shards, total_shards)
+        matrix.flags.writeable = False
+        _encoding_matrices[key] = matrix
+    return _encoding_matrices[key]
+
+
+class DecodeMatrixCache:
+    # Inverted decode matrices keyed on (data, parity, erasure bitmap). The
+    # rows that get inverted follow from which shards survived, so under
+    # churn recurring loss patterns skip the Gauss-Jordan step entirely.
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.matrices = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def decode_matrix(self, data_shards, parity_shards, erasures, build):
+        key = (data_shards, parity_shards, erasures)
+        matrix = self.matrices.get(key)
+        if matrix is not None:
+            self.hits += 1
+            count('rs.decode_matrix.hit')
+            self.matrices.move_to_end(key)
+            return matrix
+        self.misses += 1
+        count('rs.decode_matrix.miss')
+        with span('rs.invert'):
+            matrix = build()
+        matrix.flags.writeable = False
+        self.matrices[key] = matrix
+        while len(self.matrices) > self.maxsize:
+            self.matrices.popitem(last=False)
+        return matrix
+
+    def clear(self):
+        self.matrices.clear()
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def code_shards(matrix, inputs):
+    # matrix . inputs, where each input row is a whole shard: one table
+    # gather and XOR per input shard, vectorized over every output row and byte
+    output = np.zeros((len(matrix), inputs.shape[1]), dtype=np.uint8)
+    for j in range(inputs.shape[0]):
+        output ^= MUL_TABLE[matrix[:, j][:, None], inputs[j][None, :]]
+    return output
+
+
+class ReedSolomon:
+    # Mirrors reedsolomon.New(dataShards, parityShards). Shards are bytes
+    # objects, None for a missing shard; encode and reconstruct fill the
+    # list in place like their Go counterparts fill the [][]byte.
+    def __init__(self, data_shards, parity_shards, decode_cache=None):
+        if data_shards <= 0 or parity_shards < 0:
+            raise ValueError("cannot create Encoder with less than one data shard or less than zero parity shards")
+        if data_shards + parity_shards > MAX_SHARDS:
+            raise ValueError(f"at most {MAX_SHARDS} shards are supported in GF(2^8)")
+        self.data_shards = data_shards
+        self.parity_shards = parity_shards
+        self.total_shards = data_shards + parity_shards
+        self.matrix = encoding_matrix(data_shards, self.total_shards)
+        self.parity = self.matrix[data_shards:]
+        self.decode_cache = decode_cache
+
+    def _check_shards(self, shards, allow_missing):
+        # checkShards in Go: every shard the size of the first non-empty one,
+        # empty ones only tolerated while reconstructing
+        if len(shards) != self.total_shards:
+            raise ValueError("too few shards given")
+        size = next((len(s) for s in shards if s), 0)
+        if not size:
+            raise ValueError("no shard data")
+        for shard in shards:
+            if (len(shard) if shard else 0) != size and (shard or not allow_missing):
+                raise ValueError("shard sizes do not match")
+        return size
+
+    @staticmethod
+    def _stack(shards):
+        return np.frombuffer(b''.join(shards), dtype=np.uint8).reshape(len(shards), -1)
+
+    def split(self, data):
+        # Equal data shards of ceil(len / data_shards) bytes, the last one zero
+        # padded, plus zeroed parity shards ready for encode
+        if not data:
+            raise ValueError("not enough data to fill the number of requested shards")
+        per_shard = -(-len(data) // self.data_shards)
+        padded = bytes(data) + bytes(per_shard * self.total_shards - len(data))
+        return [padded[i * per_shard:(i + 1) * per_shard] for i in range(self.total_shards)]
+
+    def encode(self, shards):
+        self._check_shards(shards, False)
+        parity = code_shards(self.parity, self._stack(shards[:self.data_shards]))
+        shards[self.data_shards:] = [row.tobytes() for row in parity]
+
+    def verify(self, shards):
+        self._check_shards(shards, False)
+        parity = code_shards(self.parity, self._stack(shards[:self.data_shards]))
+        return parity.tobytes() == b''.join(shards[self.data_shards:])
+
+    def reconstruct(self, shards):
+        self._check_shards(shards, True)
+        present = [i for i, s in enumerate(shards) if s]
+        if len(present) == self.total_shards:
+            return
+        if len(present) < self.data_shards:
+            raise ValueError("too few shards given")
+        missing_data = [i for i in range(self.data_shards) if not shards[i]]
+        if missing_data:
+            # Any data_shards surviving rows of the encoding matrix are
+            # invertible; their inverse maps those shards back to the data
+            rows = present[:self.data_shards]
+            if self.decode_cache is None:
+                decode = gf_invert(self.matrix[rows])
+            else:
+                erasures = sum(1 << i for i, s in enumerate(shards) if not s)
+                decode = self.decode_cache.decode_matrix(self.data_shards, self.parity_shards, erasures,
+                                                         lambda: gf_invert(self.matrix[rows]))
+            recovered = code_shards(decode[missing_data], self._stack([shards[i] for i in rows]))
+            for i, row in zip(missing_data, recovered):
+                shards[i] = row.tobytes()
+        missing_parity = [i for i in range(self.data_shards, self.total_shards) if not shards[i]]
+        if missing_parity:
+            parity = code_shards(self.matrix[missing_parity], self._stack(shards[:self.data_shards]))
+            for i, row in zip(missing_parity, parity):
+                shards[i] = row.tobytes()
+
+    def join(self, shards, out_size):
+        data = b''.join(s for s in shards[:self.data_shards] if s)
+        if any(not s for s in shards[:self.data_shards]) or len(data) < out_size:
+            raise ValueError("not enough data to fill the number of requested shards")
+        return data[:out_size]
+
+
+class ShardMetadata:
+    def __init__(self, data_shards, parity_shards, original_size):
+        self.data_shards = data_shards
+        self.parity_shards = parity_shards
+        self.original_size = original_size
+
+    def to_json(self):
+        return {'DataShards': self.data_shards, 'ParityShards': self.parity_shards,
+                'OriginalSize': self.original_size}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['DataShards'], data['ParityShards'], data['OriginalSize'])
+
+
+class EncodedRoutingTable:
+    def __init__(self, metadata, shards):
+        self.metadata = metadata
+        self.shards = shards
+
+    def to_json(self):
+        # encoding/json writes []byte as standard base64 and a nil slice as null
+        return {'Metadata': self.metadata.to_json(),
+                'Shards': [base64.b64encode(s).decode() if s is not None else None for s in self.shards]}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(ShardMetadata.from_json(data['Metadata']),
+                   [base64.b64decode(s) if s is not None else None for s in data['Shards']])
+
+
+# Loss patterns recur across quorums, so every decoder shares one cache
+default_decode_cache = DecodeMatrixCache()
+
+
+def go_json_marshal(table):
+    # Byte-identical to json.Marshal of a map[string]string: sorted keys, no
+    # whitespace, UTF-8 output with Go's HTML escaping
+    text = json.dumps(table, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    for char, escape in GO_JSON_ESCAPES:
+        text = text.replace(char, escape)
+    return text.encode()
+
+
+def encode_routing_table(table, data_shards, parity_shards):
+    # EncodeRoutingTableWithParams
+    with span('rs.encode'):
+        data = go_json_marshal(table)
+        codec = ReedSolomon(data_shards, parity_shards)
+        shards = codec.split(data)
+        codec.encode(shards)
+    return EncodedRoutingTable(ShardMetadata(data_shards, parity_shards, len(data)), shards)
+
+
+def decode_routing_table(encoded, decode_cache=default_decode_cache):
+    # DecodeRoutingTable: reconstruct, verify, join and unmarshal
+    meta = encoded.metadata
+    shards = list(encoded.shards)
+    if len(shards) != meta.data_shards + meta.parity_shards:
+        raise ValueError("shard count mismatch")
+    with span('rs.decode'):
+        codec = ReedSolomon(meta.data_shards, meta.parity_shards, decode_cache)
+        shards = [s if s else None for s in shards]
+        codec.reconstruct(shards)
+        if not codec.verify(shards):
+            raise ValueError("verification failed: data integrity compromised")
+        return json.loads(codec.join(shards, meta.original_size))
@@ -0,0 +1,126 @@
+from random import randrange
+
+from ec_point_operation import curve
+from sign import hash_to_int
+from ec_backend import add, multi_multiply, multiply, multiply_g
+from lagrange import lagrange_coefficients_at_zero
+from instrumentation import span
+
+# ECDSA sign/verify with the same inputs and outputs as the demo's sign.py,
+# with all point arithmetic going through the selected EC backend, and the
+# two-round threshold signing the quorums use on top of a dealt presignature.
+
+# Stored with every run record: sign_times under this protocol measure
+# nothing like those of the shared-nonce signing the stored json/ results
+# were timed with, so the two must not be compared
+SIGNING_PROTOCOL = 'dealt-presignature'
+
+
+def sign(private_key, message):
+    r, s, _ = sign_recoverable(private_key, message)
+    return r, s
+
+
+def sign_recoverable(private_key, message):
+    # Also returns the parity of the nonce point's y coordinate, which lets a
+    # verifier rebuild R from r (needed for batch verification).
+    with span('hash'):
+        e = hash_to_int(message)
+    r, s = 0, 0
+    while not r or not s:
+        k = randrange(1, curve.n)
+        x, y = multiply_g(k)
+        r = x % curve.n
+        s = ((e + r * private_key) * pow(k, -1, curve.n)) % curve.n
+    return r, s, y & 1
+
+
+def deal_shares(secret, size, degree, modulus=curve.n):
+    # Shamir sharing: f(0) = secret, random higher coefficients, evaluated at
+    # the peers' x-coordinates 1..size (Horner)
+    coefficients = [secret] + [randrange(modulus) for _ in range(degree)]
+    shares = []
+    for x in range(1, size + 1):
+        value = 0
+        for c in reversed(coefficients):
+            value = (value * x + c) % modulus
+        shares.append(value)
+    return shares
+
+
+def deal_presignature(key_shares, threshold, modulus=curve.n):
+    # Dealer preprocessing for one signing round, in place of a distributed
+    # presigning protocol: Shamir sharings (degree threshold - 1) of a fresh
+    # nonce k, of w = k^-1 and of u = w*d. u_i is w*d_i re-randomized with a
+    # sharing of zero, so neither a peer nor any threshold - 1 of them learn
+    # k or w. Message independent, so it can run ahead of the request.
+    # Returns one (k_i, w_i, u_i) per peer.
+    k = randrange(1, modulus)
+    w = pow(k, -1, modulus)
+    size, degree = len(key_shares), threshold - 1
+    nonce_shares = deal_shares(k, size, degree, modulus)
+    inverse_shares = deal_shares(w, size, degree, modulus)
+    zero_shares = deal_shares(0, size, degree, modulus)
+    return [(k_i, w_i, (w * d_i + z_i) % modulus)
+            for k_i, w_i, d_i, z_i in zip(nonce_shares, inverse_shares, key_shares, zero_shares)]
+
+
+def nonce_commitment(presignature_share):
+    # Signing round 1, run by every signer: R_i = k_i*G
+    return multiply_g(presignature_share[0])
+
+
+def combine_nonce(xs, commitments, modulus=curve.n):
+    # R = k*G by Lagrange interpolation in the exponent over the signers'
+    # R_i; returns (r, y parity of R), which the signers need for round 2
+    x, y = multi_multiply(lagrange_coefficients_at_zero(xs, modulus), commitments)
+    return x % modulus, y & 1
+
+
+def sign_share(presignature_share, message, nonce):
+    # Signing round 2: s_i = e*w_i + r*u_i. Shares are linear, so Lagrange
+    # interpolation at 0 over t+1 of them gives w*(e + r*d), a standard
+    # ECDSA signature under the quorum key with nonce point R.
+    r, v = nonce
+    _, w_i, u_i = presignature_share
+    with span('hash'):
+        e = hash_to_int(message)
+    return r, (e * w_i + r * u_i) % curve.n, v
+
+
+def presignature_commitment(presignature_share):
+    # (W_i, U_i) = (w_i*G, u_i*G), published by the dealer; a valid share
+    # satisfies s_i*G = e*W_i + r*U_i (see batch_verify.batch_verify_shares)
+    _, w_i, u_i = presignature_share
+    return multiply_g(w_i), multiply_g(u_i)
+
+
+def corrupt_share(nonce):
+    # What a Byzantine peer sends: well-formed, but not a valid share
+    r, v = nonce
+    return r, randrange(1, curve.n), v
+
+
+def lift_x(x, parity):
+    # The curve point with this x coordinate and y parity, or None
+    if x >= curve.p:
+        return None
+    y_squared = (pow(x, 3, curve.p) + curve.a * x + curve.b) % curve.p
+    y = pow(y_squared, (curve.p + 1) // 4, curve.p)
+    if y * y % curve.p != y_squared:
+        return None
+    return (x, y if y & 1 == parity else curve.p - y)
+
+
+def verify_signature(public_key, message, signature):
+    # Takes (r, s) or a recoverable (r, s, v); v is not needed here
+    with span('hash'):
+        e = hash_to_int(message)
+    r, s = signature[:2]
+    w = pow(s, -1, curve.n)
+    u1 = (e * w) % curve.n
+    u2 = (r * w) % curve.n
+    point = add(multiply_g(u1), multiply(u2, public_key))
+    if point is None:
+        return False
+    return (r % curve.n) == (point[0] % curve.n)
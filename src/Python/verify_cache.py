@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+
+from signing import verify_signature
+from instrumentation import count
+
+
+def message_timestamp(message):
+    # Requests end in |<time.time()>; None when the message carries no timestamp
+    try:
+        return float(message.rsplit('|', 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class TTLCache:
+    # LRU mapping whose entries also expire ttl seconds after the timestamp of
+    # the message they belong to, so a replayed answer is only trusted while
+    # its request is still fresh.
+    def __init__(self, maxsize, ttl, clock=time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires > self.clock():
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return value
+            del self.entries[key]
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def put(self, key, value, timestamp=None):
+        expires = (self.clock() if timestamp is None else timestamp) + self.ttl
+        if expires <= self.clock():
+            return
+        self.entries[key] = (value, expires)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class VerificationCache:
+    # Verified (public key, message, signature) tuples and recent lookup
+    # results. Forwarded or replayed routing answers then skip hashing and
+    # the signature check; only successful verifications are remembered.
+    def __init__(self, maxsize=4096, ttl=60.0):
+        self.signatures = TTLCache(maxsize, ttl)
+        self.lookups = TTLCache(maxsize, ttl)
+
+    def verify(self, public_key, message, signature):
+        key = (public_key, message, signature)
+        if self.signatures.get(key):
+            count('verify_cache.hit')
+            return True
+        count('verify_cache.miss')
+        verified = verify_signature(public_key, message.encode(), signature)
+        if verified:
+            self.signatures.put(key, True, message_timestamp(message))
+        return verified
+
+    def lookup_result(self, public_key, message):
+        return self.lookups.get((public_key, message))
+
+    def remember_lookup(self, public_key, message, result):
+        self.lookups.put((public_key, message), result, message_timestamp(message))
+
+    def metrics(self):
+        return {
+            'signature_hits': self.signatures.hits,
+            'signature_misses': self.signatures.misses,
+            'signature_hit_rate': self.signatures.hit_rate(),
+            'lookup_hits': self.lookups.hits,
+            'lookup_misses': self.lookups.misses,
+            'lookup_hit_rate': self.lookups.hit_rate(),
+            'expired': self.signatures.expired + self.lookups.expired,
+        }